@@ -61,6 +61,10 @@ export default function ChatInterface() {
         const response = await fetch(`http://localhost:8001/api/chat/notifications?session_id=${getUserId()}&since_timestamp=${lastTimestamp}`);
         if (response.ok) {
           const data = await response.json();
+          // Resume after every returned row, not just the assistant ones shown below
+          if (data.cursor) {
+            lastTimestamp = data.cursor;
+          }
           if (data.messages && data.messages.length > 0) {
             // Filter out any messages that might already exist (only keep assistant messages for notifications)
             const notificationMessages = data.messages.filter((msg: any) => msg.role === 'assistant');
@@ -82,12 +86,6 @@ export default function ChatInterface() {
                 return trulyNewMessages.length > 0 ? [...prev, ...trulyNewMessages] : prev;
               });
 
-              // Update timestamp to the latest message timestamp
-              if (notificationMessages.length > 0) {
-                const latestMsg = notificationMessages[notificationMessages.length - 1];
-                lastTimestamp = latestMsg.timestamp || new Date().toISOString();
-              }
-
               // Show browser notification if supported (only for new messages)
               if (newMessages.length > 0 && 'Notification' in window && Notification.permission === 'granted') {
                 new Notification('Personal Assistant Reminder', {
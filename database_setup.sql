@@ -15,6 +15,16 @@ CREATE TABLE IF NOT EXISTS public.conversations (
 -- Create index for better query performance
 CREATE INDEX IF NOT EXISTS idx_conversations_phone_number ON public.conversations(phone_number);
 CREATE INDEX IF NOT EXISTS idx_conversations_timestamp ON public.conversations(timestamp);
+-- Serves both the latest-N history window (scanned backwards) and since-cursor range reads
+CREATE INDEX IF NOT EXISTS idx_conversations_phone_timestamp ON public.conversations(phone_number, timestamp);
+
+-- Create conversation summaries table (latest summary per phone number is read on every turn)
+CREATE TABLE IF NOT EXISTS public.conversation_summaries (
+    phone_number TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (phone_number, created_at)
+);
 
 -- Create reminders table
 CREATE TABLE IF NOT EXISTS public.reminders (
@@ -40,12 +50,17 @@ CREATE INDEX IF NOT EXISTS idx_reminders_due ON public.reminders(scheduled_time,
 -- Enable Row Level Security (RLS)
 ALTER TABLE public.conversations ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.reminders ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.conversation_summaries ENABLE ROW LEVEL SECURITY;
 
 -- Create policies for conversations table
 -- Allow all operations for now (you can restrict this later based on your auth requirements)
 CREATE POLICY "Enable all operations for conversations" ON public.conversations
     FOR ALL USING (true) WITH CHECK (true);
 
+-- Create policies for conversation summaries table
+CREATE POLICY "Enable all operations for conversation_summaries" ON public.conversation_summaries
+    FOR ALL USING (true) WITH CHECK (true);
+
 -- Create policies for reminders table
 -- Allow all operations for now (you can restrict this later based on your auth requirements)
 CREATE POLICY "Enable all operations for reminders" ON public.reminders
@@ -55,4 +70,6 @@ CREATE POLICY "Enable all operations for reminders" ON public.reminders
 GRANT ALL ON public.conversations TO anon;
 GRANT ALL ON public.reminders TO anon;
 GRANT ALL ON public.conversations TO authenticated;
-GRANT ALL ON public.reminders TO authenticated;
\ No newline at end of file
+GRANT ALL ON public.reminders TO authenticated;
+GRANT ALL ON public.conversation_summaries TO anon;
+GRANT ALL ON public.conversation_summaries TO authenticated;
\ No newline at end of file
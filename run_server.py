@@ -18,8 +18,16 @@ def main():
         "server.app:app",
         host=settings.server_host,
         port=settings.server_port,
-        reload=True,
-        log_level="info"
+        reload=settings.reload,
+        workers=None if settings.reload else settings.workers,
+        log_level="info",
+        access_log=settings.access_log,
+        # "auto" picks uvloop and httptools (installed with uvicorn[standard])
+        # and falls back to asyncio and h11
+        loop="auto",
+        http="auto",
+        timeout_keep_alive=settings.keep_alive_timeout,
+        limit_concurrency=settings.limit_concurrency,
     )
 
 if __name__ == "__main__":
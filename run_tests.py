@@ -119,15 +119,17 @@ async def main():
         ("Message Conductor", test_message_conductor_basic),
     ]
 
-    passed = 0
     total = len(tests)
 
-    for test_name, test_func in tests:
-        try:
-            if await test_func():
-                passed += 1
-        except Exception as e:
-            print(f"❌ Test {test_name} crashed: {e}")
+    # The tests share no state, so run them concurrently
+    results = await asyncio.gather(*(test_func() for _, test_func in tests), return_exceptions=True)
+
+    passed = 0
+    for (test_name, _), result in zip(tests, results):
+        if isinstance(result, Exception):
+            print(f"❌ Test {test_name} crashed: {result}")
+        elif result is True:
+            passed += 1
 
     print(f"\n📊 Test Results: {passed}/{total} passed")
 
@@ -138,4 +140,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
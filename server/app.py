@@ -1,113 +1,186 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from .config import get_settings
 from .logging_config import configure_logging, get_logger
-from .routes import api_router
 
 logger = get_logger(__name__)
 
+# The 500 envelope never changes, so serialize it once
+_500_BODY = b'{"ok":false,"error":"Internal server error"}'
 
-# Register global exception handlers for consistent error responses across the API
-def register_exception_handlers(app: FastAPI) -> None:
-    @app.exception_handler(RequestValidationError)
-    async def _validation_exception_handler(request: Request, exc: RequestValidationError):
-        logger.debug("validation error", extra={"errors": exc.errors(), "path": str(request.url)})
-        return JSONResponse(
-            {"ok": False, "error": "Invalid request", "detail": exc.errors()},
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        )
+# Explicit CORS allow-lists covering what the web client sends
+_CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+_CORS_ALLOW_HEADERS = ("Content-Type",)
 
-    @app.exception_handler(HTTPException)
-    async def _http_exception_handler(request: Request, exc: HTTPException):
-        logger.debug(
-            "http error",
-            extra={"detail": exc.detail, "status": exc.status_code, "path": str(request.url)},
-        )
-        detail = exc.detail
-        if not isinstance(detail, str):
-            detail = json.dumps(detail)
-        return JSONResponse({"ok": False, "error": detail}, status_code=exc.status_code)
-
-    @app.exception_handler(Exception)
-    async def _unhandled_exception_handler(request: Request, exc: Exception):
-        logger.exception("Unhandled error", extra={"path": str(request.url)})
-        return JSONResponse(
-            {"ok": False, "error": "Internal server error"},
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
 
+async def _validation_exception_handler(request: Request, exc: RequestValidationError):
+    logger.debug("validation error", extra={"errors": exc.errors(), "path": str(request.url)})
+    return ORJSONResponse(
+        {"ok": False, "error": "Invalid request", "detail": exc.errors()},
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    )
 
-configure_logging()
-_settings = get_settings()
 
-app = FastAPI(
-    title=_settings.app_name,
-    version=_settings.app_version,
-    docs_url=_settings.resolved_docs_url,
-    redoc_url=None,
-)
+async def _http_exception_handler(request: Request, exc: HTTPException):
+    logger.debug(
+        "http error",
+        extra={"detail": exc.detail, "status": exc.status_code, "path": str(request.url)},
+    )
+    return ORJSONResponse({"ok": False, "error": exc.detail}, status_code=exc.status_code)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_settings.cors_allow_origins,
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-register_exception_handlers(app)
-app.include_router(api_router)
+async def _unhandled_exception_handler(request: Request, exc: Exception):
+    logger.exception("Unhandled error", extra={"path": str(request.url)})
+    return Response(
+        content=_500_BODY,
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        media_type="application/json",
+    )
 
 
-@app.on_event("startup")
-# Initialize background services when the app starts
-async def _start_services() -> None:
-    print("🚀 Personal Assistant starting up...", flush=True)
+# Register global exception handlers for consistent error responses across the API
+def register_exception_handlers(app: FastAPI) -> None:
+    app.add_exception_handler(RequestValidationError, _validation_exception_handler)
+    app.add_exception_handler(HTTPException, _http_exception_handler)
+    app.add_exception_handler(Exception, _unhandled_exception_handler)
+
+
+async def _shutdown_step(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    """Run one shutdown step, logging its failure instead of aborting the rest."""
 
+    try:
+        await step()
+    except Exception as e:
+        logger.error(f"❌ Shutdown step '{name}' failed: {e}")
+
+
+# Start background services with the app and stop them on shutdown
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    logger.info("🚀 Personal Assistant starting up...")
+
+    background_manager = None
     try:
         from .services.background_services import get_background_manager
         from .services.supabase_client import init_database_tables
 
-        print("📊 Initializing database tables...", flush=True)
-        # Initialize database tables
-        await init_database_tables()
-
-        print("⚙️  Starting background services...", flush=True)
-        # Start background services
+        logger.info("📊 Initializing database tables and ⚙️  starting background services...")
+        # The table check only verifies access and the background services
+        # create nothing it depends on, so both can run concurrently
         background_manager = get_background_manager()
-        await background_manager.start_services()
+        results = await asyncio.gather(
+            init_database_tables(),
+            background_manager.start_services(),
+            return_exceptions=True,
+        )
+        for step, result in zip(("database tables", "background services"), results):
+            if isinstance(result, Exception):
+                logger.error(f"❌ Startup step '{step}' failed: {result}")
 
-        print("✅ Personal Assistant startup completed successfully", flush=True)
+        # Shared by every request through the route dependencies
+        from .conductor.runtime import MessageConductorRuntime
+        from .services.gmail.client import GmailClient
+
+        app.state.gmail_client = GmailClient()
+        try:
+            app.state.conductor = MessageConductorRuntime()
+        except ValueError as e:
+            # Left for the dependency to retry so chat requests report the error
+            logger.warning(f"⚠️ Conductor not initialized at startup: {e}")
+
+        logger.info("✅ Personal Assistant startup completed successfully")
 
     except Exception as e:
-        print(f"❌ Error during startup: {e}", flush=True)
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error during startup: {e}")
 
+    yield
 
-@app.on_event("shutdown")
-# Gracefully shutdown background services when the app stops
-async def _stop_services() -> None:
     logger.info("Personal Assistant shutting down...")
 
-    try:
-        from .services.background_services import get_background_manager
+    # Each step runs even if an earlier one fails, so shared clients and pools always close
+    if background_manager is not None:
+        await _shutdown_step("background services", background_manager.stop_services)
 
-        # Stop background services
-        background_manager = get_background_manager()
-        await background_manager.stop_services()
+    from .services.conversation import get_conversation_memory
 
-        logger.info("Personal Assistant shutdown completed")
+    # Write out conversation messages still queued for the database, without
+    # creating a memory instance if no request ever used one
+    if get_conversation_memory.cache_info().currsize:
+        await _shutdown_step("conversation memory", get_conversation_memory().flush)
 
-    except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+    from .openrouter_client import close_openrouter_client
+    from .services.postgres import close_pg_pool
+
+    await _shutdown_step("OpenRouter client", close_openrouter_client)
+    await _shutdown_step("Postgres pool", close_pg_pool)
+
+    logger.info("Personal Assistant shutdown completed")
+
+
+_app: Optional[FastAPI] = None
+
+
+def _build_app() -> FastAPI:
+    """Construct the FastAPI application, its middleware and routes."""
+
+    configure_logging()
+    settings = get_settings()
+
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        docs_url=settings.resolved_docs_url,
+        redoc_url=None,
+        default_response_class=ORJSONResponse,
+        lifespan=_lifespan,
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_allow_origins,
+        allow_credentials=False,
+        allow_methods=_CORS_ALLOW_METHODS,
+        allow_headers=_CORS_ALLOW_HEADERS,
+    )
+
+    register_exception_handlers(app)
+
+    # Route modules pull in the LLM, Supabase and Composio clients
+    from .routes import api_router
+
+    app.include_router(api_router)
+
+    return app
+
+
+def get_app() -> FastAPI:
+    """Return the application, building it on first access."""
+    global _app
+    if _app is None:
+        _app = _build_app()
+    return _app
+
+
+def __getattr__(name: str):
+    # PEP 562: build the app lazily so `import server.app` stays cheap
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Force the app to be built at import time (e.g. for CI smoke tests)
+if os.getenv("PERSONAL_ASSISTANT_EAGER_IMPORT", "0") != "0":
+    get_app()
 
 
-__all__ = ["app"]
\ No newline at end of file
+__all__ = ["app", "get_app"]
\ No newline at end of file
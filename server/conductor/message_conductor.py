@@ -1,5 +1,8 @@
 """Message Conductor agent for handling user conversations."""
 
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Any
 
 from .tools import get_conductor_tool_schemas
@@ -7,19 +10,42 @@ from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
+_SYSTEM_PROMPT_PATH = Path(__file__).parent / "system_prompt.md"
 
+# Static wrappers around the per-turn conductor payloads
+_HIST_OPEN = "<conversation_history>\n"
+_HIST_CLOSE = "\n</conversation_history>"
+_MSG_OPEN = "<new_user_message>\n"
+_MSG_CLOSE = "\n</new_user_message>"
+
+
+@dataclass(slots=True)
+class ConductorMessage:
+    """A chat message handed to the Message Conductor loop."""
+
+    role: str
+    content: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the OpenRouter wire representation."""
+        return {"role": self.role, "content": self.content}
+
+
+@lru_cache(maxsize=1)
 def build_conductor_system_prompt() -> str:
-    """Build the system prompt for the Message Conductor."""
+    """Build the system prompt for the Message Conductor.
+
+    The prompt file is read once per process; call
+    ``build_conductor_system_prompt.cache_clear()`` to force a reload.
+    """
 
     try:
-        from pathlib import Path
-        prompt_path = Path(__file__).parent / "system_prompt.md"
+        # A single read; a missing file surfaces as FileNotFoundError
+        return _SYSTEM_PROMPT_PATH.read_bytes().decode("utf-8")
 
-        if prompt_path.exists():
-            return prompt_path.read_text(encoding="utf-8")
-        else:
-            logger.warning("System prompt file not found, using fallback")
-            return _get_fallback_system_prompt()
+    except FileNotFoundError:
+        logger.warning("System prompt file not found, using fallback")
+        return _get_fallback_system_prompt()
 
     except Exception as e:
         logger.error(f"Error loading system prompt: {e}")
@@ -48,24 +74,20 @@ def prepare_conductor_message_with_history(
     user_message: str,
     conversation_history: str,
     message_type: str = "user"
-) -> List[Dict[str, Any]]:
+) -> List[ConductorMessage]:
     """Prepare messages for the Message Conductor with conversation history."""
 
-    messages = []
-
-    # Add conversation history if available
-    if conversation_history.strip():
-        messages.append({
-            "role": "user",
-            "content": f"<conversation_history>\n{conversation_history}\n</conversation_history>"
-        })
+    # Layout is [system prompt, history, new message]. Only the system prompt is a
+    # stable prefix for provider-side prompt caching: the transcript is a sliding
+    # latest-N window led by a summary that is regenerated, so it changes every turn
 
     # Add the current message (only support user messages now)
-    content = f"<new_user_message>\n{user_message}\n</new_user_message>"
+    message = ConductorMessage("user", "".join((_MSG_OPEN, user_message, _MSG_CLOSE)))
 
-    messages.append({
-        "role": "user",
-        "content": content
-    })
+    # Prepend conversation history if available; isspace() stops at the
+    # first non-blank char instead of copying the history like strip()
+    if conversation_history and not conversation_history.isspace():
+        history = ConductorMessage("user", "".join((_HIST_OPEN, conversation_history, _HIST_CLOSE)))
+        return [history, message]
 
-    return messages
\ No newline at end of file
+    return [message]
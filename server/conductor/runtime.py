@@ -1,21 +1,62 @@
 """Message Conductor Runtime - handles LLM calls for user and specialist turns."""
 
 import asyncio
-import json
+import logging
 import re
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set
 
-from .message_conductor import build_conductor_system_prompt, prepare_conductor_message_with_history
-from .tools import ToolResult, get_conductor_tool_schemas, handle_conductor_tool_call
+import orjson
+
+from .message_conductor import (
+    ConductorMessage,
+    build_conductor_system_prompt,
+    prepare_conductor_message_with_history,
+)
+from .tools import (
+    ToolResult,
+    get_conductor_tool_schemas,
+    get_conductor_tool_schemas_json,
+    get_planner_worker,
+    handle_conductor_tool_call,
+)
 from ..config import get_settings
 from ..openrouter_client import request_chat_completion
 from ..logging_config import get_logger
+from ..services.conversation import ConversationSummarizer, format_transcript, get_conversation_memory
 
 logger = get_logger(__name__)
 
+# Keywords that suggest complex multi-step tasks
+_COMPLEX_KEYWORDS = frozenset([
+    "summarize", "analyze", "check", "search", "fetch", "get", "find",
+    "send", "create", "update", "delete", "list", "compare", "review",
+    "remind", "schedule", "in", "minutes", "hours", "days", "at", "tomorrow"
+])
 
-@dataclass
+# Whole words, so keywords are matched by set lookup rather than substring search
+_WORD_RE = re.compile(r"\w+")
+
+# Time-based scheduling patterns
+_TIME_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"\bin\s+\d+\s*(minutes?|mins?|hours?|hrs?|days?)",
+    r"\bat\s+\d{1,2}(:\d{2})?\s*(am|pm|AM|PM)?",
+    r"\btomorrow\b",
+    r"\bnext\s+(week|month|monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
+    r"\d{1,2}:\d{2}",
+))
+
+# Tools that hand work to the Planner -> Worker architecture
+_WORKER_TOOLS = frozenset({"plan_and_execute_task", "schedule_task_for_later"})
+
+# Per-tool execution timeouts in seconds; complex operations get longer
+_DEFAULT_TOOL_TIMEOUT = 120.0
+_TOOL_TIMEOUTS: Dict[str, float] = {"plan_and_execute_task": 180.0}
+
+# Tools that only build a result in-process and cannot hang, so run without a timeout
+_INSTANT_TOOLS = frozenset({"send_message_to_user", "send_draft", "wait", "send_notification"})
+
+@dataclass(slots=True)
 class ConductorResult:
     """Result from the Message Conductor."""
 
@@ -26,16 +67,17 @@ class ConductorResult:
     workers_used: int = 0  # Track workers used for new architecture
 
 
-@dataclass
+@dataclass(slots=True)
 class _ToolCall:
     """Parsed tool invocation from an LLM response."""
 
     identifier: Optional[str]
     name: str
     arguments: Dict[str, Any]
+    error: Optional[str] = None  # Set when the arguments could not be parsed
 
 
-@dataclass
+@dataclass(slots=True)
 class _LoopSummary:
     """Aggregate information produced by the conductor loop."""
 
@@ -57,6 +99,11 @@ class MessageConductorRuntime:
         self.model = settings.message_conductor_model
         self.settings = settings
         self.tool_schemas = get_conductor_tool_schemas()
+        # Constant per process, so encode once instead of on every LLM call
+        self.tool_schemas_json = get_conductor_tool_schemas_json()
+        # Static per process; reusing the exact same string also keeps the
+        # prompt prefix byte-identical for provider-side prompt caching
+        self.system_prompt = build_conductor_system_prompt()
 
         if not self.api_key:
             raise ValueError(
@@ -69,25 +116,22 @@ class MessageConductorRuntime:
         try:
             logger.info(f"🎯 NEW USER MESSAGE: '{user_message}' from {from_number}")
 
-            from ..services.conversation import get_conversation_memory
-            from ..services.conversation.summarization import ConversationSummarizer
-
             memory = get_conversation_memory()
 
             # Record user message
             await memory.record_user_message(from_number, user_message)
 
-            # Get conversation history
-            conversation_history = await memory.get_conversation_transcript(from_number)
+            # Get conversation history (flushes the user message recorded above)
+            history, latest_summary = await memory.get_context_bundle(from_number)
+            conversation_history = format_transcript(history, latest_summary)
 
             # Check if we should summarize
             summarizer = ConversationSummarizer()
             if await summarizer.should_summarize_conversation(from_number, memory):
-                await summarizer.summarize_conversation(from_number, memory)
-                # Reload conversation history after summarization
-                conversation_history = await memory.get_conversation_transcript(from_number)
+                # Kept off the reply path; the next turn's transcript leads with the new summary
+                summarizer.summarize_in_background(from_number, memory)
 
-            system_prompt = build_conductor_system_prompt()
+            system_prompt = self.system_prompt
             messages = prepare_conductor_message_with_history(
                 user_message, conversation_history, message_type="user"
             )
@@ -126,7 +170,7 @@ class MessageConductorRuntime:
             # TODO: Load conversation history from database
             conversation_history = ""
 
-            system_prompt = build_conductor_system_prompt()
+            system_prompt = self.system_prompt
             messages = prepare_conductor_message_with_history(
                 specialist_message, conversation_history, message_type="specialist"
             )
@@ -156,17 +200,23 @@ class MessageConductorRuntime:
     async def _run_conductor_loop(
         self,
         system_prompt: str,
-        messages: List[Dict[str, Any]],
+        conductor_messages: List[ConductorMessage],
         from_number: str
     ) -> _LoopSummary:
         """Iteratively query the LLM until it issues a final response."""
 
         summary = _LoopSummary()
+        # Wire-format history led by the system prompt, so the client sends it as-is
+        # instead of copying the list to prepend it; later turns are appended as dicts
+        messages: List[Dict[str, Any]] = [
+            {"role": "system", "content": system_prompt},
+            *(message.to_dict() for message in conductor_messages),
+        ]
 
         for iteration in range(self.MAX_TOOL_ITERATIONS):
             try:
                 response = await asyncio.wait_for(
-                    self._make_llm_call(system_prompt, messages),
+                    self._make_llm_call(messages),
                     timeout=20.0  # 20 second timeout for LLM calls
                 )
                 assistant_message = self._extract_assistant_message(response)
@@ -176,7 +226,8 @@ class MessageConductorRuntime:
                 summary.last_assistant_text = "I'm sorry, I'm having trouble processing your request right now. Please try again."
                 break
 
-            assistant_content = (assistant_message.get("content") or "").strip()
+            content = assistant_message.get("content") or ""
+            assistant_content = content.strip()
             if assistant_content:
                 summary.last_assistant_text = assistant_content
 
@@ -185,7 +236,7 @@ class MessageConductorRuntime:
 
             assistant_entry: Dict[str, Any] = {
                 "role": "assistant",
-                "content": assistant_message.get("content", "") or "",
+                "content": content,
             }
             if raw_tool_calls:
                 assistant_entry["tool_calls"] = raw_tool_calls
@@ -194,34 +245,21 @@ class MessageConductorRuntime:
             if not parsed_tool_calls:
                 break
 
-            for tool_call in parsed_tool_calls:
-                summary.tool_names.append(tool_call.name)
+            summary.tool_names.extend(tool_call.name for tool_call in parsed_tool_calls)
 
-                if tool_call.name in ["plan_and_execute_task", "schedule_task_for_later"]:
+            for tool_call in parsed_tool_calls:
+                if tool_call.name in _WORKER_TOOLS:
                     # Track new architecture usage
                     summary.workers_executed += 1
                     logger.info(f"🚀 NEW ARCHITECTURE: Using {tool_call.name} - Worker execution #{summary.workers_executed}")
 
-                # Add timeout to prevent hanging
-                try:
-                    # Different timeouts based on tool complexity
-                    timeout_seconds = 120.0  # 2 minute default timeout
-                    if tool_call.name in ["plan_and_execute_task"]:
-                        timeout_seconds = 180.0  # 3 minutes for complex operations
-
-                    logger.info(f"🔧 TOOL: Executing {tool_call.name} with {timeout_seconds}s timeout")
-                    result = await asyncio.wait_for(
-                        self._execute_tool(tool_call, from_number),
-                        timeout=timeout_seconds
-                    )
-                except asyncio.TimeoutError:
-                    logger.error(f"Tool execution timed out: {tool_call.name}")
-                    result = ToolResult(
-                        success=False,
-                        response="⚠️ Tool execution timed out. Please try again.",
-                        user_message=None
-                    )
+            # Tool calls from one turn are independent, so run them concurrently;
+            # gather keeps results in call order to match the tool_call ids
+            results = await asyncio.gather(
+                *(self._execute_tool_with_timeout(tool_call, from_number) for tool_call in parsed_tool_calls)
+            )
 
+            for tool_call, result in zip(parsed_tool_calls, results):
                 if result.user_message:
                     summary.user_messages.append(result.user_message)
 
@@ -239,11 +277,31 @@ class MessageConductorRuntime:
 
         return summary
 
-    async def _make_llm_call(
-        self,
-        system_prompt: str,
-        messages: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
+    async def _execute_tool_with_timeout(self, tool_call: _ToolCall, from_number: str) -> ToolResult:
+        """Execute a tool call, converting a timeout into a failed result."""
+
+        if tool_call.name in _INSTANT_TOOLS:
+            return await self._execute_tool(tool_call, from_number)
+
+        # Different timeouts based on tool complexity
+        timeout_seconds = _TOOL_TIMEOUTS.get(tool_call.name, _DEFAULT_TOOL_TIMEOUT)
+
+        # Add timeout to prevent hanging
+        try:
+            logger.info(f"🔧 TOOL: Executing {tool_call.name} with {timeout_seconds}s timeout")
+            return await asyncio.wait_for(
+                self._execute_tool(tool_call, from_number),
+                timeout=timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Tool execution timed out: {tool_call.name}")
+            return ToolResult(
+                success=False,
+                payload={"error": "⚠️ Tool execution timed out. Please try again."},
+                user_message=None
+            )
+
+    async def _make_llm_call(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Make an LLM call via OpenRouter."""
 
         logger.debug(
@@ -253,9 +311,8 @@ class MessageConductorRuntime:
         return await request_chat_completion(
             model=self.model,
             messages=messages,
-            system=system_prompt,
             api_key=self.api_key,
-            tools=self.tool_schemas,
+            tools=self.tool_schemas_json,
         )
 
     def _extract_assistant_message(self, response: Dict[str, Any]) -> Dict[str, Any]:
@@ -285,7 +342,8 @@ class MessageConductorRuntime:
                     _ToolCall(
                         identifier=raw.get("id"),
                         name=name,
-                        arguments={"__invalid_arguments__": error},
+                        arguments={},
+                        error=error,
                     )
                 )
                 continue
@@ -308,11 +366,15 @@ class MessageConductorRuntime:
             return raw_arguments, None
 
         if isinstance(raw_arguments, str):
-            if not raw_arguments.strip():
+            stripped = raw_arguments.strip()
+            if not stripped:
                 return {}, None
+            # Anything that is not an object literal would be rejected after decoding anyway
+            if stripped[0] != "{":
+                return {}, "decoded arguments were not an object"
             try:
-                parsed = json.loads(raw_arguments)
-            except json.JSONDecodeError as exc:
+                parsed = orjson.loads(stripped)
+            except orjson.JSONDecodeError as exc:
                 return {}, f"invalid json: {exc}"
             if isinstance(parsed, dict):
                 return parsed, None
@@ -323,17 +385,17 @@ class MessageConductorRuntime:
     async def _execute_tool(self, tool_call: _ToolCall, from_number: str) -> ToolResult:
         """Execute a tool call and convert low-level errors into structured results."""
 
-        if "__invalid_arguments__" in tool_call.arguments:
-            error = tool_call.arguments["__invalid_arguments__"]
-            self._log_tool_invocation(tool_call, stage="rejected", detail={"error": error})
-            return ToolResult(success=False, payload={"error": error})
+        if tool_call.error is not None:
+            self._log_tool_invocation(tool_call, stage="rejected", detail={"error": tool_call.error})
+            return ToolResult(success=False, payload={"error": tool_call.error})
 
         try:
             self._log_tool_invocation(tool_call, stage="start")
 
             # Add session context for web tools
             if tool_call.name == "send_notification" and "session_id" not in tool_call.arguments:
-                tool_call.arguments["session_id"] = from_number
+                # Copy on write: the arguments may be the LLM response's own dict
+                tool_call.arguments = {**tool_call.arguments, "session_id": from_number}
 
             result = await handle_conductor_tool_call(tool_call.name, tool_call.arguments)
         except Exception as exc:
@@ -374,11 +436,7 @@ class MessageConductorRuntime:
         payload: Dict[str, Any] = {
             "tool": tool_call.name,
             "status": "success" if result.success else "error",
-            "arguments": {
-                key: value
-                for key, value in tool_call.arguments.items()
-                if key != "__invalid_arguments__"
-            },
+            "arguments": tool_call.arguments,
         }
 
         if result.payload is not None:
@@ -391,7 +449,7 @@ class MessageConductorRuntime:
         """Serialize payload to JSON, falling back to repr on failure."""
 
         try:
-            return json.dumps(payload, default=str)
+            return orjson.dumps(payload, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
         except TypeError:
             return repr(payload)
 
@@ -405,16 +463,21 @@ class MessageConductorRuntime:
     ) -> None:
         """Emit structured logs for tool lifecycle events."""
 
-        cleaned_args = {
-            key: value
-            for key, value in tool_call.arguments.items()
-            if key != "__invalid_arguments__"
-        }
+        if stage == "done":
+            level = logging.INFO
+        elif stage in {"error", "rejected"}:
+            level = logging.WARNING
+        else:
+            level = logging.DEBUG
+
+        # Tool payloads can be large; skip building the record when it would be dropped
+        if not logger.isEnabledFor(level):
+            return
 
         log_payload: Dict[str, Any] = {
             "tool": tool_call.name,
             "stage": stage,
-            "arguments": cleaned_args,
+            "arguments": tool_call.arguments,
         }
 
         if result is not None:
@@ -425,12 +488,13 @@ class MessageConductorRuntime:
         if detail:
             log_payload.update(detail)
 
-        if stage == "done":
-            logger.info(f"Tool '{tool_call.name}' completed")
-        elif stage in {"error", "rejected"}:
-            logger.warning(f"Tool '{tool_call.name}' {stage}")
-        else:
-            logger.debug(f"Tool '{tool_call.name}' {stage}")
+        logger.log(
+            level,
+            "Tool '%s' %s",
+            tool_call.name,
+            "completed" if stage == "done" else stage,
+            extra=log_payload,
+        )
 
     def _finalize_response(self, summary: _LoopSummary) -> str:
         """Decide what text should be exposed to the user as the final reply."""
@@ -444,12 +508,7 @@ class MessageConductorRuntime:
         """Execute a task using the new Planner -> Worker architecture."""
 
         try:
-            from ..planner import TaskPlanner
-            from ..workers import TaskWorker
-
-            # Initialize components
-            planner = TaskPlanner()
-            worker = TaskWorker()
+            planner, worker = get_planner_worker()
 
             # Create execution plan
             logger.info(f"Creating plan for task: {task_description}")
@@ -473,35 +532,21 @@ class MessageConductorRuntime:
     def _detect_task_complexity(self, task_description: str) -> str:
         """Detect if a task should use new architecture or old specialists."""
 
-        task_lower = task_description.lower()
-
-        # Keywords that suggest complex multi-step tasks
-        complex_keywords = [
-            "summarize", "analyze", "check", "search", "fetch", "get", "find",
-            "send", "create", "update", "delete", "list", "compare", "review",
-            "remind", "schedule", "in", "minutes", "hours", "days", "at", "tomorrow"
-        ]
-
-        # Time-based scheduling patterns
-        time_patterns = [
-            r"\bin\s+\d+\s*(minutes?|mins?|hours?|hrs?|days?)",
-            r"\bat\s+\d{1,2}(:\d{2})?\s*(am|pm|AM|PM)?",
-            r"\btomorrow\b",
-            r"\bnext\s+(week|month|monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
-            r"\d{1,2}:\d{2}",
-        ]
-
         # Check for scheduling patterns
-        for pattern in time_patterns:
-            if re.search(pattern, task_description):
+        for pattern in _TIME_PATTERNS:
+            if pattern.search(task_description):
                 return "schedule"
 
-        # Check for complex task keywords
-        complex_count = sum(1 for keyword in complex_keywords if keyword in task_lower)
+        # Check for distinct complex task keywords; only 0, 1 or 2+ matters
+        matched: Set[str] = set()
+        for match in _WORD_RE.finditer(task_description):
+            word = match.group(0).lower()
+            if word in _COMPLEX_KEYWORDS:
+                matched.add(word)
+                if len(matched) >= 2:
+                    return "complex"
 
-        if complex_count >= 2:
-            return "complex"
-        elif complex_count >= 1:
+        if matched:
             return "simple_complex"
         else:
             return "simple"
@@ -509,7 +554,5 @@ class MessageConductorRuntime:
     def _should_use_new_architecture(self, task_description: str) -> bool:
         """Determine if task should use new Planner-Worker architecture."""
 
-        complexity = self._detect_task_complexity(task_description)
-
         # Use new architecture for complex and scheduled tasks
-        return complexity in ["complex", "schedule", "simple_complex"]
\ No newline at end of file
+        return self._detect_task_complexity(task_description) != "simple"
\ No newline at end of file
@@ -1,9 +1,15 @@
 """Tools available to the Message Conductor."""
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from ..logging_config import get_logger
+from ..planner import TaskPlanner
+from ..tools.scheduler_tool import schedule_task, store_complex_task
+from ..workers import TaskWorker
 # Removed WhatsApp dependency - now using web interface
 
 logger = get_logger(__name__)
@@ -17,8 +23,15 @@ class ToolResult:
     user_message: Optional[str] = None
 
 
+@lru_cache(maxsize=1)
+def get_planner_worker() -> Tuple[TaskPlanner, TaskWorker]:
+    """Get the shared planner and worker; both hold only configuration."""
+    return TaskPlanner(), TaskWorker()
+
+
+@lru_cache(maxsize=1)
 def get_conductor_tool_schemas() -> List[Dict[str, Any]]:
-    """Get tool schemas for the Message Conductor."""
+    """Get tool schemas for the Message Conductor (built once; treat as read-only)."""
     return [
         {
             "type": "function",
@@ -158,27 +171,24 @@ def get_conductor_tool_schemas() -> List[Dict[str, Any]]:
     ]
 
 
+@lru_cache(maxsize=1)
+def get_conductor_tool_schemas_json() -> "orjson.Fragment":
+    """Get the tool schemas pre-encoded once, for splicing into request payloads."""
+    return orjson.Fragment(orjson.dumps(get_conductor_tool_schemas()))
+
+
 async def handle_conductor_tool_call(tool_name: str, arguments: Dict[str, Any]) -> ToolResult:
     """Handle tool calls for the Message Conductor."""
 
+    handler = _TOOL_DISPATCH.get(tool_name)
+    if handler is None:
+        return ToolResult(success=False, payload={"error": f"Unknown tool: {tool_name}"})
+
     try:
-        if tool_name == "plan_and_execute_task":
-            return await _handle_plan_and_execute_task(arguments)
-        elif tool_name == "schedule_task_for_later":
-            return await _handle_schedule_task_for_later(arguments)
-        elif tool_name == "send_message_to_user":
-            return await _handle_send_message_to_user(arguments)
-        elif tool_name == "send_draft":
-            return _handle_send_draft(arguments)
-        elif tool_name == "wait":
-            return _handle_wait(arguments)
-        elif tool_name == "send_notification":
-            return await _handle_send_notification(arguments)
-        else:
-            return ToolResult(success=False, payload={"error": f"Unknown tool: {tool_name}"})
+        return await handler(arguments)
 
     except Exception as e:
-        logger.error(f"Error executing tool {tool_name}: {e}")
+        logger.error("Error executing tool %s: %s", tool_name, e)
         return ToolResult(success=False, payload={"error": str(e)})
 
 
@@ -195,7 +205,7 @@ async def _handle_send_message_to_user(arguments: Dict[str, Any]) -> ToolResult:
     )
 
 
-def _handle_send_draft(arguments: Dict[str, Any]) -> ToolResult:
+async def _handle_send_draft(arguments: Dict[str, Any]) -> ToolResult:
     """Handle displaying an email draft."""
     to = arguments.get("to", "")
     subject = arguments.get("subject", "")
@@ -210,11 +220,11 @@ def _handle_send_draft(arguments: Dict[str, Any]) -> ToolResult:
     )
 
 
-def _handle_wait(arguments: Dict[str, Any]) -> ToolResult:
+async def _handle_wait(arguments: Dict[str, Any]) -> ToolResult:
     """Handle wait instruction."""
     reason = arguments.get("reason", "")
 
-    logger.info(f"Wait instruction: {reason}")
+    logger.info("Wait instruction: %s", reason)
 
     return ToolResult(
         success=True,
@@ -229,7 +239,7 @@ async def _handle_send_notification(arguments: Dict[str, Any]) -> ToolResult:
 
     # For web interface, notifications are handled differently
     # They could be stored and shown in the UI, or sent via other means
-    logger.info(f"Notification ({priority}): {message}")
+    logger.info("Notification (%s): %s", priority, message)
 
     return ToolResult(
         success=True,
@@ -250,25 +260,25 @@ async def _handle_plan_and_execute_task(arguments: Dict[str, Any]) -> ToolResult
         )
 
     try:
-        from ..planner import TaskPlanner
-        from ..workers import TaskWorker
-
-        # Initialize components
-        planner = TaskPlanner()
-        worker = TaskWorker()
+        planner, worker = get_planner_worker()
 
         # Add default user_id if not provided
         if "user_id" not in context:
             context["user_id"] = "web_user"
 
         # Create and execute plan
-        logger.info(f"📋 PLANNER: Creating execution plan for task: '{task_description}'")
+        logger.info("📋 PLANNER: Creating execution plan for task: '%s'", task_description)
         plan = await planner.create_plan(task_description, context)
-        logger.info(f"📋 PLANNER: Plan created with {len(plan.steps)} steps - ID: {plan.plan_id}")
+        logger.info("📋 PLANNER: Plan created with %d steps - ID: %s", len(plan.steps), plan.plan_id)
 
-        logger.info(f"⚙️ WORKER: Starting plan execution...")
+        logger.info("⚙️ WORKER: Starting plan execution...")
         result = await worker.execute_plan(plan, context)
-        logger.info(f"⚙️ WORKER: Execution {'✅ COMPLETED' if result.success else '❌ FAILED'} - {result.steps_executed}/{len(plan.steps)} steps")
+        logger.info(
+            "⚙️ WORKER: Execution %s - %d/%d steps",
+            "✅ COMPLETED" if result.success else "❌ FAILED",
+            result.steps_executed,
+            len(plan.steps),
+        )
 
         if result.success:
             return ToolResult(
@@ -293,11 +303,12 @@ async def _handle_plan_and_execute_task(arguments: Dict[str, Any]) -> ToolResult
             )
 
     except Exception as e:
-        logger.error(f"Failed to execute planned task: {e}")
+        error = str(e)
+        logger.error("Failed to execute planned task: %s", error)
         return ToolResult(
             success=False,
-            payload={"error": str(e)},
-            user_message=f"❌ **System Error**: {str(e)}"
+            payload={"error": error},
+            user_message=f"❌ **System Error**: {error}"
         )
 
 
@@ -316,23 +327,20 @@ async def _handle_schedule_task_for_later(arguments: Dict[str, Any]) -> ToolResu
         )
 
     try:
-        from ..tools.scheduler_tool import schedule_task, store_complex_task
-        from datetime import datetime, timedelta
-
         # Add default user_id if not provided
         user_id = context.get("user_id", "web_user")
 
         if delay_minutes:
             # Schedule with delay
-            logger.info(f"⏰ SCHEDULER: Scheduling task for {delay_minutes} minutes from now")
+            logger.info("⏰ SCHEDULER: Scheduling task for %s minutes from now", delay_minutes)
             result = await schedule_task(task_description, delay_minutes, user_id, context)
         elif execution_time:
             # Schedule for specific time
-            logger.info(f"⏰ SCHEDULER: Scheduling task for specific time: {execution_time}")
+            logger.info("⏰ SCHEDULER: Scheduling task for specific time: %s", execution_time)
             result = await store_complex_task(task_description, execution_time, user_id, None)
         else:
             # Default to 1 minute delay
-            logger.info(f"⏰ SCHEDULER: No time specified, defaulting to 1 minute delay")
+            logger.info("⏰ SCHEDULER: No time specified, defaulting to 1 minute delay")
             result = await schedule_task(task_description, 1, user_id, context)
 
         if result.get("success"):
@@ -352,9 +360,21 @@ async def _handle_schedule_task_for_later(arguments: Dict[str, Any]) -> ToolResu
             )
 
     except Exception as e:
-        logger.error(f"Failed to schedule task: {e}")
+        error = str(e)
+        logger.error("Failed to schedule task: %s", error)
         return ToolResult(
             success=False,
-            payload={"error": str(e)},
-            user_message=f"❌ **Scheduling Error**: {str(e)}"
-        )
\ No newline at end of file
+            payload={"error": error},
+            user_message=f"❌ **Scheduling Error**: {error}"
+        )
+
+
+# Tool name -> handler; every handler is a coroutine so dispatch is a single await
+_TOOL_DISPATCH: Dict[str, Callable[[Dict[str, Any]], Awaitable[ToolResult]]] = {
+    "plan_and_execute_task": _handle_plan_and_execute_task,
+    "schedule_task_for_later": _handle_schedule_task_for_later,
+    "send_message_to_user": _handle_send_message_to_user,
+    "send_draft": _handle_send_draft,
+    "wait": _handle_wait,
+    "send_notification": _handle_send_notification,
+}
@@ -1,25 +1,29 @@
 """Configuration management for Personal Assistant."""
 
 import os
-from functools import lru_cache
+import re
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, Tuple
 
 from pydantic import BaseModel, Field
 
 
+# KEY=value, tolerating surrounding whitespace; comments and blank lines never match
+_ENV_LINE_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*?)\s*$")
+
+
 def _load_env_file() -> None:
     """Load .env from root directory if present."""
     env_path = Path(__file__).parent.parent / ".env"
-    if not env_path.is_file():
-        return
     try:
-        for line in env_path.read_text(encoding="utf-8").splitlines():
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#") and "=" in stripped:
-                key, value = stripped.split("=", 1)
-                key, value = key.strip(), value.strip().strip("'\"")
-                if key and value and key not in os.environ:
+        with env_path.open("r", encoding="utf-8") as env_file:
+            for line in env_file:
+                match = _ENV_LINE_RE.match(line)
+                if not match:
+                    continue
+                key, value = match.group(1), match.group(2).strip("'\"")
+                if value and key not in os.environ:
                     os.environ[key] = value
     except Exception:
         pass
@@ -49,6 +53,16 @@ class Settings(BaseModel):
     # Server runtime
     server_host: str = Field(default=os.getenv("PERSONAL_ASSISTANT_HOST", "0.0.0.0"))
     server_port: int = Field(default=_env_int("PERSONAL_ASSISTANT_PORT", 8001))
+    # Auto-reload is for local development only; it cannot be combined with workers
+    reload: bool = Field(default=os.getenv("PERSONAL_ASSISTANT_RELOAD", "0") != "0")
+    # Each worker runs its own background services (email monitor, trigger scheduler)
+    workers: int = Field(default=_env_int("WEB_CONCURRENCY", 1))
+    # Keep idle client connections open across the short requests of a chat session
+    keep_alive_timeout: int = Field(default=_env_int("PERSONAL_ASSISTANT_KEEP_ALIVE_TIMEOUT", 75))
+    # Maximum concurrent connections before uvicorn answers 503 (0 = unlimited)
+    limit_concurrency: Optional[int] = Field(default=_env_int("PERSONAL_ASSISTANT_LIMIT_CONCURRENCY", 0) or None)
+    # Per-request access log lines; routes already log what they handle
+    access_log: bool = Field(default=os.getenv("PERSONAL_ASSISTANT_ACCESS_LOG", "0") != "0")
 
     # LLM model selection
     message_conductor_model: str = Field(default="x-ai/grok-4-fast:free")
@@ -56,6 +70,9 @@ class Settings(BaseModel):
     email_classifier_model: str = Field(default="x-ai/grok-4-fast:free")
     summarizer_model: str = Field(default="x-ai/grok-4-fast:free")
 
+    # Maximum simultaneous OpenRouter requests; extra calls wait for a free slot
+    openrouter_max_concurrency: int = Field(default=_env_int("PERSONAL_ASSISTANT_OPENROUTER_MAX_CONCURRENCY", 32))
+
     # Credentials / integrations
     openrouter_api_key: Optional[str] = Field(default=os.getenv("OPENROUTER_API_KEY"))
     composio_gmail_auth_config_id: Optional[str] = Field(default=os.getenv("COMPOSIO_GMAIL_AUTH_CONFIG_ID"))
@@ -67,6 +84,10 @@ class Settings(BaseModel):
     # Supabase database
     supabase_url: Optional[str] = Field(default=os.getenv("SUPABASE_URL"))
     supabase_key: Optional[str] = Field(default=os.getenv("SUPABASE_KEY"))
+    # Optional direct Postgres DSN; conversation memory uses an asyncpg pool when set
+    supabase_db_url: Optional[str] = Field(default=os.getenv("SUPABASE_DB_URL"))
+    pg_pool_min_size: int = Field(default=_env_int("PERSONAL_ASSISTANT_PG_POOL_MIN_SIZE", 2))
+    pg_pool_max_size: int = Field(default=_env_int("PERSONAL_ASSISTANT_PG_POOL_MAX_SIZE", 10))
 
     # HTTP behaviour
     cors_allow_origins_raw: str = Field(default=os.getenv("PERSONAL_ASSISTANT_CORS_ALLOW_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000,http://localhost:3001,http://localhost:3002"))
@@ -76,26 +97,40 @@ class Settings(BaseModel):
     # Conversation summarisation controls
     conversation_summary_threshold: int = Field(default=100)
     conversation_summary_tail_size: int = Field(default=10)
+    # Latest messages folded into the running summary each time it is regenerated
+    conversation_summary_window: int = Field(default=_env_int("PERSONAL_ASSISTANT_SUMMARY_WINDOW", 40))
+
+    # Seconds to reuse a generated plan when the same task is planned again (0 = off)
+    plan_cache_ttl: int = Field(default=_env_int("PERSONAL_ASSISTANT_PLAN_CACHE_TTL", 3600))
 
-    @property
-    def cors_allow_origins(self) -> List[str]:
+    # Seconds to serve a session's history from memory; bounds staleness from other workers (0 = off)
+    history_cache_ttl: int = Field(default=_env_int("PERSONAL_ASSISTANT_HISTORY_CACHE_TTL", 30))
+
+    # Derived values are computed on first access; settings are not mutated afterwards
+    @cached_property
+    def cors_allow_origins(self) -> Tuple[str, ...]:
         """Parse CORS origins from comma-separated string."""
         if self.cors_allow_origins_raw.strip() in {"", "*"}:
-            return ["*"]
-        return [origin.strip() for origin in self.cors_allow_origins_raw.split(",") if origin.strip()]
+            return ("*",)
+        return tuple(origin.strip() for origin in self.cors_allow_origins_raw.split(",") if origin.strip())
 
-    @property
+    @cached_property
     def resolved_docs_url(self) -> Optional[str]:
         """Return documentation URL when docs are enabled."""
         return (self.docs_url or "/docs") if self.enable_docs else None
 
-    @property
+    @cached_property
     def summarization_enabled(self) -> bool:
         """Flag indicating conversation summarisation is active."""
         return self.conversation_summary_threshold > 0
 
 
-@lru_cache(maxsize=1)
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
\ No newline at end of file
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
\ No newline at end of file
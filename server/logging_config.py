@@ -1,15 +1,25 @@
 """Logging configuration for Personal Assistant."""
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Any
 
 # Configure root logger
 logger = logging.getLogger("personal_assistant")
 
+_configured = False
+
 
 def configure_logging() -> None:
-    """Set up logging configuration."""
+    """Set up logging configuration (repeat calls are no-ops)."""
+
+    global _configured
+    if _configured:
+        return
+    _configured = True
 
     # Configure root logger first
     root_logger = logging.getLogger()
@@ -29,14 +39,21 @@ def configure_logging() -> None:
     )
     console_handler.setFormatter(formatter)
 
+    # Loggers only enqueue records; a listener thread does the blocking stdout
+    # writes so logging never stalls the event loop
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+    listener.start()
+    # Drain anything still queued when the process exits
+    atexit.register(listener.stop)
+
     # Add handler to root logger
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(queue_handler)
 
-    # Configure our specific logger
-    logger.handlers.clear()
-    logger.addHandler(console_handler)
+    # Configure our specific logger; records reach the queue through root
     logger.setLevel(logging.INFO)
-    logger.propagate = False
+    logger.propagate = True
 
     # Also configure specific loggers that might exist
     for logger_name in ['server.services.triggers.scheduler', 'server.tools.scheduler_tool']:
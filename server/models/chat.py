@@ -1,6 +1,6 @@
 """Chat and conversation models."""
 
-from typing import List, Optional
+from typing import List, Optional, TypedDict
 from pydantic import BaseModel
 
 
@@ -11,11 +11,18 @@ class ChatMessage(BaseModel):
     timestamp: Optional[str] = None
 
 
+class ChatMessageDict(TypedDict, total=False):
+    """Internal chat message; validated into ChatMessage only at the API boundary."""
+    role: str
+    content: str
+    timestamp: Optional[str]
 
 
 class ChatHistoryResponse(BaseModel):
     """Response containing chat history."""
     messages: List[ChatMessage]
+    # Timestamp of the newest returned message, to send back as since_timestamp
+    cursor: Optional[str] = None
 
 
 class ChatHistoryClearResponse(BaseModel):
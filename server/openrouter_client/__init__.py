@@ -1,5 +1,5 @@
 """OpenRouter client for LLM integration."""
 
-from .client import request_chat_completion
+from .client import close_openrouter_client, request_chat_completion, stream_chat_completion
 
-__all__ = ["request_chat_completion"]
\ No newline at end of file
+__all__ = ["close_openrouter_client", "request_chat_completion", "stream_chat_completion"]
\ No newline at end of file
@@ -1,35 +1,111 @@
 """OpenRouter API client for LLM requests."""
 
 import asyncio
-import json
-from typing import Any, Dict, List, Optional
+import math
+import random
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
 import httpx
+import orjson
 
+from ..config import get_settings
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
-async def request_chat_completion(
+OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "HTTP-Referer": "https://github.com/personal-assistant",
+    "X-Title": "Personal Assistant",
+}
+
+# Retry policy for rate limits and 5xx, shared by buffered and streamed requests
+_MAX_RETRIES = 3
+_BASE_RETRY_DELAY = 1.0
+# Upper bound on any single wait, so a large Retry-After cannot park a request
+_MAX_RETRY_DELAY = 10.0
+
+# Shared across all OpenRouter calls so requests reuse pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+
+# Caps in-flight OpenRouter requests so bursts queue here instead of triggering 429s
+_request_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared OpenRouter HTTP client, creating it on first use."""
+
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the shared OpenRouter concurrency limiter, creating it on first use."""
+
+    global _request_semaphore
+    if _request_semaphore is None:
+        _request_semaphore = asyncio.Semaphore(max(1, get_settings().openrouter_max_concurrency))
+    return _request_semaphore
+
+
+@lru_cache(maxsize=8)
+def _bearer_token(api_key: str) -> str:
+    """Return the Authorization header value for an API key."""
+    return f"Bearer {api_key}"
+
+
+def _is_retryable(status_code: int) -> bool:
+    """Return True for rate-limit and transient server error statuses."""
+    return status_code == 429 or 500 <= status_code < 600
+
+
+def _retry_delay(response: httpx.Response, attempt: int, base_delay: float) -> float:
+    """Return how long to wait before retrying, honouring Retry-After when present."""
+
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            seconds = None  # HTTP-date or garbage; fall back to backoff
+        if seconds is not None and math.isfinite(seconds):
+            return min(max(seconds, 0.0), _MAX_RETRY_DELAY)
+
+    # Exponential backoff with jitter so concurrent callers do not retry in lockstep
+    return min(base_delay * (2 ** attempt) + random.random() * 0.25, _MAX_RETRY_DELAY)
+
+
+async def close_openrouter_client() -> None:
+    """Close the shared OpenRouter HTTP client and its pooled connections."""
+
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _build_request(
     model: str,
     messages: List[Dict[str, Any]],
     api_key: str,
-    system: Optional[str] = None,
-    tools: Optional[List[Dict[str, Any]]] = None,
-    max_tokens: Optional[int] = None,
-    temperature: float = 0.7,
-) -> Dict[str, Any]:
-    """Make a chat completion request to OpenRouter."""
-
-    url = "https://openrouter.ai/api/v1/chat/completions"
+    system: Optional[str],
+    tools: Optional[Union[List[Dict[str, Any]], "orjson.Fragment"]],
+    max_tokens: Optional[int],
+    temperature: float,
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Build the headers and JSON payload for a chat completion request."""
 
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/personal-assistant",
-        "X-Title": "Personal Assistant",
-    }
+    headers = {**_BASE_HEADERS, "Authorization": _bearer_token(api_key)}
 
     payload: Dict[str, Any] = {
         "model": model,
@@ -38,49 +114,131 @@ async def request_chat_completion(
     }
 
     if system:
-        # Add system message to the beginning
-        payload["messages"] = [{"role": "system", "content": system}] + messages
+        # Add system message to the beginning; a new list so the caller's is untouched.
+        # Hot callers can put the system message in messages themselves to skip this copy
+        payload["messages"] = [{"role": "system", "content": system}, *messages]
 
     if tools:
+        # Either schema dicts or an orjson.Fragment of schemas already encoded once
         payload["tools"] = tools
         payload["tool_choice"] = "auto"
 
     if max_tokens:
         payload["max_tokens"] = max_tokens
 
-    logger.debug(f"Making OpenRouter request to {model}")
+    return headers, payload
+
+
+async def request_chat_completion(
+    model: str,
+    messages: List[Dict[str, Any]],
+    api_key: str,
+    system: Optional[str] = None,
+    tools: Optional[Union[List[Dict[str, Any]], "orjson.Fragment"]] = None,
+    max_tokens: Optional[int] = None,
+    temperature: float = 0.7,
+) -> Dict[str, Any]:
+    """Make a chat completion request to OpenRouter."""
 
-    # Retry logic for rate limits
-    max_retries = 3
-    base_delay = 1
+    url = OPENROUTER_URL
+    headers, payload = _build_request(model, messages, api_key, system, tools, max_tokens, temperature)
+
+    logger.debug("Making OpenRouter request to %s", model)
+
+    # Retry logic for rate limits, server errors and transport failures
+    max_retries = _MAX_RETRIES
+    base_delay = _BASE_RETRY_DELAY
+
+    client = _get_client()
+    body = orjson.dumps(payload)
 
     for attempt in range(max_retries + 1):
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.post(url, headers=headers, json=payload)
-
-                if response.status_code == 429:  # Rate limit
-                    if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff
-                        logger.warning(f"Rate limited, retrying in {delay}s (attempt {attempt + 1}/{max_retries + 1})")
-                        await asyncio.sleep(delay)
-                        continue
-                    else:
-                        logger.error("Rate limit exceeded, max retries reached")
-                        response.raise_for_status()
-
-                response.raise_for_status()
-                result = response.json()
-                logger.debug(f"OpenRouter response received")
-                return result
-
-            except httpx.HTTPError as e:
-                if attempt == max_retries:
-                    logger.error(f"OpenRouter API error after {max_retries + 1} attempts: {e}")
-                    raise
+        try:
+            async with _get_semaphore():
+                response = await client.post(url, headers=headers, content=body)
+
+            # Rate limits and server errors are transient; anything left over,
+            # including exhausted retries, is raised by raise_for_status below
+            if _is_retryable(response.status_code) and attempt < max_retries:
+                delay = _retry_delay(response, attempt, base_delay)
+                logger.warning(f"OpenRouter returned {response.status_code}, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_retries + 1})")
+                await asyncio.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            result = orjson.loads(response.content)
+            logger.debug("OpenRouter response received")
+            return result
+
+        except httpx.HTTPStatusError as e:
+            # Retryable statuses were handled above; what reaches here is final
+            logger.error(f"OpenRouter API error: {e}")
+            raise
+        except httpx.HTTPError as e:
+            if attempt == max_retries:
+                logger.error(f"OpenRouter API error after {max_retries + 1} attempts: {e}")
+                raise
+            else:
+                logger.warning(f"Request failed (attempt {attempt + 1}), retrying: {e}")
+                await asyncio.sleep(base_delay)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse OpenRouter response: {e}")
+            raise
+
+
+async def stream_chat_completion(
+    model: str,
+    messages: List[Dict[str, Any]],
+    api_key: str,
+    system: Optional[str] = None,
+    tools: Optional[Union[List[Dict[str, Any]], "orjson.Fragment"]] = None,
+    max_tokens: Optional[int] = None,
+    temperature: float = 0.7,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream a chat completion from OpenRouter, yielding each parsed SSE chunk."""
+
+    headers, payload = _build_request(model, messages, api_key, system, tools, max_tokens, temperature)
+    payload["stream"] = True
+
+    logger.debug("Making streaming OpenRouter request to %s", model)
+
+    client = _get_client()
+    body = orjson.dumps(payload)
+
+    for attempt in range(_MAX_RETRIES + 1):
+        streaming = False
+        try:
+            async with _get_semaphore(), client.stream("POST", OPENROUTER_URL, headers=headers, content=body) as response:
+                # The status arrives before any chunk has been yielded, so retrying is safe
+                if _is_retryable(response.status_code) and attempt < _MAX_RETRIES:
+                    delay = _retry_delay(response, attempt, _BASE_RETRY_DELAY)
+                    logger.warning(f"OpenRouter returned {response.status_code}, retrying stream in {delay:.2f}s (attempt {attempt + 1}/{_MAX_RETRIES + 1})")
                 else:
-                    logger.warning(f"Request failed (attempt {attempt + 1}), retrying: {e}")
-                    await asyncio.sleep(base_delay)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse OpenRouter response: {e}")
-                raise
\ No newline at end of file
+                    response.raise_for_status()
+                    streaming = True
+
+                    async for line in response.aiter_lines():
+                        # Skip blank separators and SSE comments (": OPENROUTER PROCESSING")
+                        if not line.startswith("data: "):
+                            continue
+
+                        data = line[6:]
+                        if data == "[DONE]":
+                            break
+
+                        chunk = orjson.loads(data)
+                        if "error" in chunk:
+                            raise RuntimeError(f"OpenRouter stream error: {chunk['error']}")
+                        yield chunk
+                    return
+        except httpx.HTTPError as e:
+            # Only transport failures while opening are retried; once chunks may
+            # have been yielded, or the status is final, a retry would repeat or mask them
+            if streaming or isinstance(e, httpx.HTTPStatusError) or attempt == _MAX_RETRIES:
+                logger.error(f"OpenRouter stream error: {e}")
+                raise
+            delay = _BASE_RETRY_DELAY
+            logger.warning(f"Stream request failed (attempt {attempt + 1}), retrying: {e}")
+
+        # Sleep after the response is closed so the connection returns to the pool
+        await asyncio.sleep(delay)
@@ -0,0 +1,31 @@
+"""Exact-match cache for execution plans created by the TaskPlanner."""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+import orjson
+
+from ..config import get_settings
+from ..utils.cache import TTLCache
+
+# Plans for repeated tasks, shared by all planner instances
+_PLAN_CACHE_MAXSIZE = 256
+_plan_cache: Optional[TTLCache] = None
+
+
+def get_plan_cache() -> TTLCache:
+    """Get the process-wide plan cache, created on first use."""
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = TTLCache(maxsize=_PLAN_CACHE_MAXSIZE, ttl=get_settings().plan_cache_ttl)
+    return _plan_cache
+
+
+def plan_cache_key(model: str, task_description: str, context: Optional[Dict[str, Any]]) -> str:
+    """Return the cache key for planning a task with the given model and context."""
+    payload = orjson.dumps(
+        {"model": model, "task": task_description, "ctx": context or {}},
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
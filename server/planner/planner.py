@@ -1,103 +1,30 @@
 """Task Planner - Creates detailed execution plans for complex tasks."""
 
+import hashlib
 import json
+import logging
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 from ..config import get_settings
 from ..openrouter_client import request_chat_completion
 from ..logging_config import get_logger
+from .cache import get_plan_cache, plan_cache_key
 
 logger = get_logger(__name__)
 
+# raw_decode stops at the end of the first value, unlike orjson which needs the exact span
+_JSON_DECODER = json.JSONDecoder()
 
-@dataclass
-class PlanStep:
-    """A single step in an execution plan."""
-
-    tool: str
-    args: Dict[str, Any]
-    description: str
-    step_id: str
-
-
-@dataclass
-class ExecutionPlan:
-    """Complete execution plan with steps and metadata."""
-
-    task_description: str
-    steps: List[PlanStep]
-    plan_id: str
-    estimated_duration: Optional[str] = None
-
-
-class TaskPlanner:
-    """LLM-powered task planner that creates detailed execution plans."""
-
-    def __init__(self):
-        settings = get_settings()
-        self.api_key = settings.openrouter_api_key
-        self.model = settings.message_conductor_model  # Use same model as conductor
-
-        if not self.api_key:
-            raise ValueError("OpenRouter API key not configured")
-
-    async def create_plan(self, task_description: str, context: Optional[Dict[str, Any]] = None) -> ExecutionPlan:
-        """Create a detailed execution plan for the given task."""
-
-        try:
-            logger.info(f"📋 PLANNER: Starting plan creation for task: '{task_description}'")
-
-            system_prompt = self._get_planner_system_prompt()
-
-            # Build user message with context
-            user_message = f"Task: {task_description}"
-            if context:
-                user_message += f"\nContext: {json.dumps(context, default=str)}"
-                logger.info(f"📋 PLANNER: Using context: {list(context.keys())}")
-
-            messages = [{"role": "user", "content": user_message}]
-
-            response = await request_chat_completion(
-                model=self.model,
-                messages=messages,
-                system=system_prompt,
-                api_key=self.api_key,
-                tools=[]  # Planner doesn't call tools, just creates plans
-            )
-
-            # Extract plan from response
-            assistant_message = response.get("choices", [{}])[0].get("message", {})
-            content = assistant_message.get("content", "")
-
-            if not content:
-                raise ValueError("Empty response from planner")
-
-            # Parse the plan from the response
-            plan = await self._parse_plan_response(content, task_description)
-
-            logger.info(f"📋 PLANNER: ✅ Plan created successfully!")
-            logger.info(f"📋 PLANNER: Plan ID: {plan.plan_id}")
-            logger.info(f"📋 PLANNER: Steps: {len(plan.steps)}")
-            logger.info(f"📋 PLANNER: Estimated duration: {plan.estimated_duration}")
-            for i, step in enumerate(plan.steps, 1):
-                logger.info(f"📋 PLANNER: Step {i}: {step.tool} - {step.description}")
-            return plan
-
-        except Exception as e:
-            logger.error(f"Failed to create plan for task '{task_description}': {e}")
-            # Return a fallback plan
-            return self._create_fallback_plan(task_description)
-
-    def _get_planner_system_prompt(self) -> str:
-        """Get the system prompt for the planner."""
-
-        return """You are a Task Planner. Your ONLY job is to create detailed execution plans.
+# Static, so the exact same bytes lead every planner request (provider prefix caching)
+_PLANNER_SYSTEM_PROMPT = """You are a Task Planner. Your ONLY job is to create detailed execution plans.
 
 **CRITICAL RULES:**
 1. You NEVER execute tasks - you ONLY create plans
 2. You MUST output plans in the exact JSON format specified
-3. Plans must be sequential and logical
+3. Plans must be logical; list in "depends_on" the step_ids whose results or effects a step needs (steps with an empty "depends_on" may run in parallel)
 4. Each step must specify a tool and arguments
 
 **Available Tools:**
@@ -130,7 +57,8 @@ class TaskPlanner:
       "step_id": "1",
       "tool": "tool_name.function_name",
       "args": {"param1": "value1", "param2": "value2"},
-      "description": "What this step does"
+      "description": "What this step does",
+      "depends_on": []
     }
   ]
 }
@@ -147,7 +75,8 @@ For "Check my emails from today":
       "step_id": "1",
       "tool": "gmail_tool.fetch_emails",
       "args": {"user_id": "web_user", "query": "after:today", "max_results": 20},
-      "description": "Fetch recent emails from today"
+      "description": "Fetch recent emails from today",
+      "depends_on": []
     }
   ]
 }
@@ -162,19 +91,22 @@ For "Summarize my emails and send report to alice@example.com":
       "step_id": "1",
       "tool": "gmail_tool.fetch_emails",
       "args": {"user_id": "web_user", "query": "after:today", "max_results": 20},
-      "description": "Fetch recent emails to summarize"
+      "description": "Fetch recent emails to summarize",
+      "depends_on": []
     },
     {
       "step_id": "2",
       "tool": "llm_tool.summarize",
       "args": {"text": "{step_1_result}", "max_length": 300},
-      "description": "Create summary of emails"
+      "description": "Create summary of emails",
+      "depends_on": ["1"]
     },
     {
       "step_id": "3",
       "tool": "gmail_tool.send_email",
       "args": {"user_id": "web_user", "to": "alice@example.com", "subject": "Email Summary Report", "body": "{step_2_result}"},
-      "description": "Send summary report via email"
+      "description": "Send summary report via email",
+      "depends_on": ["2"]
     }
   ]
 }
@@ -188,6 +120,134 @@ For "Summarize my emails and send report to alice@example.com":
 
 Create a plan for the given task now."""
 
+
+@dataclass
+class PlanStep:
+    """A single step in an execution plan."""
+
+    tool: str
+    args: Dict[str, Any]
+    description: str
+    step_id: str
+    # step_ids this step needs; None means undeclared, so it runs after the previous step
+    depends_on: Optional[List[str]] = None
+
+
+@dataclass
+class ExecutionPlan:
+    """Complete execution plan with steps and metadata."""
+
+    task_description: str
+    steps: List[PlanStep]
+    plan_id: str
+    estimated_duration: Optional[str] = None
+
+
+def _task_digest(task_description: str) -> str:
+    """Return a stable short digest of a task for plan ids (unlike the seeded builtin hash)."""
+    return hashlib.blake2b(task_description.encode(), digest_size=8).hexdigest()
+
+
+def _parse_depends_on(raw: Any) -> Optional[List[str]]:
+    """Normalize a step's declared dependencies; None when the plan did not declare any."""
+
+    if not isinstance(raw, list):
+        return None
+    return [str(step_id) for step_id in raw]
+
+
+def _extract_first_json_object(content: str, start: int) -> Dict[str, Any]:
+    """Decode the first complete JSON object at or after start, ignoring trailing text."""
+
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(content, start)
+        except json.JSONDecodeError:
+            start = content.find('{', start + 1)
+            continue
+        if isinstance(value, dict):
+            return value
+        start = content.find('{', start + 1)
+
+    raise ValueError("No JSON object found in response")
+
+
+class TaskPlanner:
+    """LLM-powered task planner that creates detailed execution plans."""
+
+    def __init__(self):
+        settings = get_settings()
+        self.api_key = settings.openrouter_api_key
+        self.model = settings.message_conductor_model  # Use same model as conductor
+
+        if not self.api_key:
+            raise ValueError("OpenRouter API key not configured")
+
+    async def create_plan(self, task_description: str, context: Optional[Dict[str, Any]] = None) -> ExecutionPlan:
+        """Create a detailed execution plan for the given task."""
+
+        try:
+            logger.info("📋 PLANNER: Starting plan creation for task: '%s'", task_description)
+
+            # Plans are recipes the worker executes fresh, so a repeated task can reuse one
+            plan_cache = get_plan_cache()
+            cache_key = plan_cache_key(self.model, task_description, context)
+            cached_plan = plan_cache.get(cache_key)
+            if cached_plan is not None:
+                logger.info("📋 PLANNER: ♻️ Reusing cached plan %s", cached_plan.plan_id)
+                return cached_plan
+
+            system_prompt = self._get_planner_system_prompt()
+
+            # Build user message with context
+            user_message = f"Task: {task_description}"
+            if context:
+                user_message += f"\nContext: {orjson.dumps(context, default=str, option=orjson.OPT_NON_STR_KEYS).decode()}"
+                logger.info("📋 PLANNER: Using context: %s", list(context))
+
+            messages = [{"role": "user", "content": user_message}]
+
+            response = await request_chat_completion(
+                model=self.model,
+                messages=messages,
+                system=system_prompt,
+                api_key=self.api_key,
+                tools=[]  # Planner doesn't call tools, just creates plans
+            )
+
+            # Extract plan from response
+            assistant_message = response.get("choices", [{}])[0].get("message", {})
+            content = assistant_message.get("content", "")
+
+            if not content:
+                raise ValueError("Empty response from planner")
+
+            # Parse the plan from the response
+            plan = await self._parse_plan_response(content, task_description)
+            plan_cache.set(cache_key, plan)
+
+            # One record with a joined step summary, built only when INFO is on
+            if logger.isEnabledFor(logging.INFO):
+                step_lines = "".join(
+                    f"\n📋 PLANNER: Step {i}: {step.tool} - {step.description}"
+                    for i, step in enumerate(plan.steps, 1)
+                )
+                logger.info(
+                    "📋 PLANNER: ✅ Plan created successfully! Plan ID: %s, steps: %d, estimated duration: %s%s",
+                    plan.plan_id, len(plan.steps), plan.estimated_duration, step_lines,
+                )
+            return plan
+
+        except Exception as e:
+            logger.error("Failed to create plan for task '%s': %s", task_description, e)
+            # Return a fallback plan
+            return self._create_fallback_plan(task_description)
+
+    def _get_planner_system_prompt(self) -> str:
+        """Get the system prompt for the planner."""
+
+        return _PLANNER_SYSTEM_PROMPT
+
     async def _parse_plan_response(self, content: str, task_description: str) -> ExecutionPlan:
         """Parse the LLM response into an ExecutionPlan object."""
 
@@ -201,33 +261,38 @@ Create a plan for the given task now."""
                 raise ValueError("No JSON found in response")
 
             json_str = content[json_start:json_end]
-            plan_data = json.loads(json_str)
+            try:
+                plan_data = orjson.loads(json_str)
+            except orjson.JSONDecodeError:
+                # Stray braces in surrounding prose; find the first complete object instead
+                plan_data = _extract_first_json_object(content, json_start)
 
             # Validate required fields
             if not all(key in plan_data for key in ["plan_id", "steps"]):
                 raise ValueError("Missing required fields in plan")
 
             # Convert to ExecutionPlan
-            steps = []
-            for step_data in plan_data.get("steps", []):
-                step = PlanStep(
+            steps = [
+                PlanStep(
                     tool=step_data.get("tool", ""),
-                    args=step_data.get("args", {}),
+                    args=step_data.get("args") or {},
                     description=step_data.get("description", ""),
-                    step_id=step_data.get("step_id", "")
+                    step_id=step_data.get("step_id", ""),
+                    depends_on=_parse_depends_on(step_data.get("depends_on"))
                 )
-                steps.append(step)
+                for step_data in plan_data["steps"] or ()
+            ]
 
             return ExecutionPlan(
                 task_description=plan_data.get("task_description", task_description),
                 steps=steps,
-                plan_id=plan_data.get("plan_id", f"plan_{hash(task_description)}"),
+                plan_id=plan_data.get("plan_id", f"plan_{_task_digest(task_description)}"),
                 estimated_duration=plan_data.get("estimated_duration")
             )
 
         except Exception as e:
-            logger.error(f"Failed to parse plan response: {e}")
-            logger.debug(f"Response content: {content}")
+            logger.error("Failed to parse plan response: %s", e)
+            logger.debug("Response content: %s", content)
             raise ValueError(f"Invalid plan format: {e}")
 
     def _create_fallback_plan(self, task_description: str) -> ExecutionPlan:
@@ -244,6 +309,6 @@ Create a plan for the given task now."""
         return ExecutionPlan(
             task_description=task_description,
             steps=[fallback_step],
-            plan_id=f"fallback_{hash(task_description)}",
+            plan_id=f"fallback_{_task_digest(task_description)}",
             estimated_duration="1 minute"
         )
\ No newline at end of file
@@ -1,19 +1,36 @@
 """Chat routes for web interface."""
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+import re
+from datetime import datetime
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from ..models.chat import ChatMessage, ChatHistoryResponse
+from ..models.chat import ChatHistoryResponse
 from ..conductor.runtime import MessageConductorRuntime
-from ..services.conversation import get_conversation_memory
+from ..services.conversation import get_conversation_events, get_conversation_memory
+from .dependencies import get_conductor
 from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# Longest a long-poll or idle stream is held open before answering
+_MAX_WAIT_SECONDS = 25.0
+
+# Trailing "Z" or a "+" decoded to a space in query strings, both meaning UTC
+_TS_UTC_SUFFIX_RE = re.compile(r"(?:Z| 00:00)$")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO timestamp, accepting the UTC suffix variants seen from clients."""
+    return datetime.fromisoformat(_TS_UTC_SUFFIX_RE.sub("+00:00", value))
+
 
 class ChatRequest(BaseModel):
     """Chat request model."""
@@ -29,13 +46,15 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/send", response_model=ChatResponse)
-async def send_message(request: ChatRequest) -> ChatResponse:
+async def send_message(
+    request: ChatRequest,
+    runtime: MessageConductorRuntime = Depends(get_conductor),
+) -> ChatResponse:
     """Send a message to the assistant and get a response."""
 
     try:
         logger.info(f"🌐 WEB API: Received message from {request.session_id}: '{request.message}'")
 
-        runtime = MessageConductorRuntime()
         result = await runtime.execute(request.message, request.session_id)
 
         logger.info(f"🌐 WEB API: Returning response (success: {result.success}, workers: {result.workers_used}, specialists: {result.specialists_used})")
@@ -52,14 +71,15 @@ async def send_message(request: ChatRequest) -> ChatResponse:
 
 
 @router.get("/history", response_model=ChatHistoryResponse)
-async def get_chat_history(session_id: str = "web_user") -> ChatHistoryResponse:
+async def get_chat_history(session_id: str = "web_user") -> Dict[str, Any]:
     """Get chat history for a session."""
 
     try:
         memory = get_conversation_memory()
         messages = await memory.get_conversation_history(session_id, limit=100)
 
-        return ChatHistoryResponse(messages=messages)
+        # response_model validates the plain message dicts once on the way out
+        return {"messages": messages}
 
     except Exception as e:
         logger.error(f"Error getting chat history: {e}")
@@ -67,73 +87,83 @@ async def get_chat_history(session_id: str = "web_user") -> ChatHistoryResponse:
 
 
 @router.delete("/history")
-async def clear_chat_history(session_id: str = "web_user") -> JSONResponse:
+async def clear_chat_history(session_id: str = "web_user") -> ORJSONResponse:
     """Clear chat history for a session."""
 
     try:
         memory = get_conversation_memory()
         await memory.clear_conversation(session_id)
 
-        return JSONResponse({"ok": True, "message": "Chat history cleared"})
+        return ORJSONResponse({"ok": True, "message": "Chat history cleared"})
 
     except Exception as e:
         logger.error(f"Error clearing chat history: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/notifications")
-async def get_new_notifications(session_id: str = "web_user", since_timestamp: Optional[str] = None) -> ChatHistoryResponse:
-    """Get new notifications (messages) since the given timestamp."""
+@router.get("/notifications", response_model=ChatHistoryResponse)
+async def get_new_notifications(
+    session_id: str = "web_user",
+    since_timestamp: Optional[str] = None,
+    wait: float = Query(0.0, ge=0.0, le=_MAX_WAIT_SECONDS),
+) -> Dict[str, Any]:
+    """Get new notifications (messages) since the given timestamp, long-polling up to wait seconds."""
 
     try:
         memory = get_conversation_memory()
 
-        # Get recent messages
-        messages = await memory.get_conversation_history(session_id, limit=50)
-
-        # Filter messages since timestamp if provided
+        # Parse the cursor once; the storage layer applies it as a range filter
+        since_dt = None
         if since_timestamp:
             try:
-                from datetime import datetime
-                # Fix common timestamp format issues
-                normalized_timestamp = since_timestamp.replace('Z', '+00:00')
-                # Fix space before timezone to + sign
-                if ' 00:00' in normalized_timestamp:
-                    normalized_timestamp = normalized_timestamp.replace(' 00:00', '+00:00')
-
-                since_dt = datetime.fromisoformat(normalized_timestamp)
+                since_dt = _parse_timestamp(since_timestamp)
                 logger.debug(f"Parsed since_timestamp: {since_dt}")
-
-                # Convert message timestamps to datetime objects for comparison
-                filtered_messages = []
-                for msg in messages:
-                    try:
-                        if isinstance(msg.timestamp, str):
-                            msg_timestamp = msg.timestamp.replace('Z', '+00:00')
-                            # Fix space before timezone to + sign for message timestamps too
-                            if ' 00:00' in msg_timestamp:
-                                msg_timestamp = msg_timestamp.replace(' 00:00', '+00:00')
-                            msg_dt = datetime.fromisoformat(msg_timestamp)
-                        else:
-                            msg_dt = msg.timestamp
-
-                        if msg_dt > since_dt:
-                            filtered_messages.append(msg)
-                    except Exception as parse_error:
-                        logger.debug(f"Failed to parse message timestamp {msg.timestamp}: {parse_error}")
-                        # If timestamp parsing fails, include the message to be safe
-                        filtered_messages.append(msg)
-
-                messages = filtered_messages
-                logger.debug(f"Filtered to {len(messages)} messages since {since_dt}")
-            except Exception as e:
+            except ValueError as e:
                 logger.warning(f"Invalid timestamp format: {since_timestamp}, error: {e}")
 
-        return ChatHistoryResponse(messages=messages)
+        # Subscribe before querying so a message recorded in between is not missed
+        with get_conversation_events().subscribe(session_id) as queue:
+            messages = await memory.get_conversation_history(session_id, limit=50, since=since_dt)
+
+            if not messages and wait:
+                try:
+                    messages = [await asyncio.wait_for(queue.get(), timeout=wait)]
+                except asyncio.TimeoutError:
+                    pass
+                while not queue.empty():
+                    messages.append(queue.get_nowait())
+
+        # Server-side cursor, so the next poll resumes exactly after these rows
+        cursor = messages[-1].get("timestamp") if messages else since_timestamp
+
+        # response_model validates the plain message dicts once on the way out
+        return {"messages": messages, "cursor": cursor}
 
     except Exception as e:
         logger.error(f"Error getting notifications: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/stream")
+async def stream_notifications(request: Request, session_id: str = "web_user") -> StreamingResponse:
+    """Push newly recorded messages for a session as Server-Sent Events."""
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        with get_conversation_events().subscribe(session_id) as queue:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=_MAX_WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"data: " + orjson.dumps(message) + b"\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 __all__ = ["router"]
\ No newline at end of file
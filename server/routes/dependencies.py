@@ -0,0 +1,24 @@
+"""Shared route dependencies backed by app-scoped singletons."""
+
+from fastapi import Request
+
+from ..conductor.runtime import MessageConductorRuntime
+from ..services.gmail.client import GmailClient
+
+
+def get_conductor(request: Request) -> MessageConductorRuntime:
+    """Return the app's conductor runtime, creating it if startup could not."""
+
+    conductor = getattr(request.app.state, "conductor", None)
+    if conductor is None:
+        conductor = request.app.state.conductor = MessageConductorRuntime()
+    return conductor
+
+
+def get_gmail_client(request: Request) -> GmailClient:
+    """Return the app's Gmail client, creating it if startup could not."""
+
+    gmail_client = getattr(request.app.state, "gmail_client", None)
+    if gmail_client is None:
+        gmail_client = request.app.state.gmail_client = GmailClient()
+    return gmail_client
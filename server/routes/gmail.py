@@ -2,17 +2,36 @@
 
 import asyncio
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from ..config import get_settings
 from ..logging_config import get_logger
 from ..services.gmail.client import GmailClient, _set_active_gmail_user_id
+from .dependencies import get_gmail_client
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/gmail", tags=["gmail"])
 
+# Composio SDK versions name the OAuth redirect attribute differently; found on first use
+_REDIRECT_ATTRS = ("redirect_url", "redirectUrl")
+_redirect_attr: Optional[str] = None
+
+
+def _get_redirect_url(connection_request: Any) -> Optional[str]:
+    """Return the OAuth redirect URL from a Composio connection request."""
+
+    global _redirect_attr
+    if _redirect_attr is None:
+        for name in _REDIRECT_ATTRS:
+            if getattr(connection_request, name, None):
+                _redirect_attr = name
+                break
+        else:
+            return None
+    return getattr(connection_request, _redirect_attr, None)
+
 
 class ConnectRequest(BaseModel):
     """Request to connect Gmail."""
@@ -60,7 +79,7 @@ async def connect_gmail(request: ConnectRequest) -> Dict[str, Any]:
             client = _get_composio_client()
             req = client.connected_accounts.initiate(user_id=user_id, auth_config_id=auth_config_id)
 
-            redirect_url = getattr(req, "redirect_url", None) or getattr(req, "redirectUrl", None)
+            redirect_url = _get_redirect_url(req)
             connection_request_id = getattr(req, "id", None)
 
             return {
@@ -86,13 +105,13 @@ async def connect_gmail(request: ConnectRequest) -> Dict[str, Any]:
 
 
 @router.post("/status")
-async def check_gmail_status(request: StatusRequest) -> Dict[str, Any]:
+async def check_gmail_status(
+    request: StatusRequest,
+    gmail_client: GmailClient = Depends(get_gmail_client),
+) -> Dict[str, Any]:
     """Check Gmail connection status."""
 
     try:
-        # Debug: Let's see what Composio returns directly
-        gmail_client = GmailClient()
-
         if not gmail_client.is_operational:
             return {
                 "ok": True,
@@ -142,12 +161,13 @@ async def check_gmail_status(request: StatusRequest) -> Dict[str, Any]:
 
 
 @router.post("/disconnect")
-async def disconnect_gmail(request: DisconnectRequest) -> Dict[str, Any]:
+async def disconnect_gmail(
+    request: DisconnectRequest,
+    gmail_client: GmailClient = Depends(get_gmail_client),
+) -> Dict[str, Any]:
     """Disconnect Gmail integration."""
 
     try:
-        gmail_client = GmailClient()
-
         # Try to revoke the connection
         success = await gmail_client.disconnect_gmail_account(request.userId)
 
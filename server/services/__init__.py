@@ -1,6 +1,7 @@
 """Services for Personal Assistant."""
 
-from .supabase_client import get_supabase_client
+from .supabase_client import get_supabase_client, run_supabase
 __all__ = [
-    "get_supabase_client"
+    "get_supabase_client",
+    "run_supabase"
 ]
\ No newline at end of file
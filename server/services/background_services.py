@@ -30,30 +30,45 @@ class BackgroundServiceManager:
 
         logger.info("Starting background services...")
 
-        try:
-            # Start email monitoring if Gmail is configured
-            if (self.settings.composio_api_key and
-                self.settings.composio_gmail_auth_config_id):
-
-                self.email_monitor = EmailMonitor()
-                await self.email_monitor.start()
-                logger.info("Email monitor started")
-            else:
-                logger.info("Gmail not configured, skipping email monitor (can be enabled later)")
-
-            # Start trigger scheduler
-            self.trigger_scheduler = TriggerScheduler()
-            await self.trigger_scheduler.start()
-            print("⏰ Trigger scheduler started - checking every 1 minute", flush=True)
-            logger.info("Trigger scheduler started")
+        # Services share no state, so warm them up concurrently
+        starting = []
+
+        # Start email monitoring if Gmail is configured
+        if (self.settings.composio_api_key and
+            self.settings.composio_gmail_auth_config_id):
+
+            self.email_monitor = EmailMonitor()
+            starting.append(("email_monitor", "Email monitor"))
+        else:
+            logger.info("Gmail not configured, skipping email monitor (can be enabled later)")
+
+        self.trigger_scheduler = TriggerScheduler()
+        starting.append(("trigger_scheduler", "Trigger scheduler"))
+
+        results = await asyncio.gather(
+            *(getattr(self, attr).start() for attr, _ in starting), return_exceptions=True
+        )
+
+        started = 0
+        for (attr, name), result in zip(starting, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to start {name.lower()}: {result}")
+                setattr(self, attr, None)
+                continue
+
+            started += 1
+            if attr == "trigger_scheduler":
+                print("⏰ Trigger scheduler started - checking every 1 minute", flush=True)
+            logger.info(f"{name} started")
+
+        if not started:
+            logger.error("Failed to start background services")
+            return
 
-            self._running = True
+        self._running = True
+        if started == len(starting):
             logger.info("All background services started successfully")
 
-        except Exception as e:
-            logger.error(f"Failed to start background services: {e}")
-            await self.stop_services()
-
     async def stop_services(self) -> None:
         """Stop all background services."""
 
@@ -62,20 +77,23 @@ class BackgroundServiceManager:
 
         logger.info("Stopping background services...")
 
-        try:
-            if self.email_monitor:
-                await self.email_monitor.stop()
-                self.email_monitor = None
-                logger.info("Email monitor stopped")
-
-            if self.trigger_scheduler:
-                await self.trigger_scheduler.stop()
-                self.trigger_scheduler = None
-                logger.info("Trigger scheduler stopped")
-
-        except Exception as e:
-            logger.error(f"Error stopping background services: {e}")
+        stopping = [
+            (name, service)
+            for name, service in (("Email monitor", self.email_monitor), ("Trigger scheduler", self.trigger_scheduler))
+            if service
+        ]
+        results = await asyncio.gather(
+            *(service.stop() for _, service in stopping), return_exceptions=True
+        )
+
+        for (name, _), result in zip(stopping, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error stopping {name.lower()}: {result}")
+            else:
+                logger.info(f"{name} stopped")
 
+        self.email_monitor = None
+        self.trigger_scheduler = None
         self._running = False
         logger.info("Background services stopped")
 
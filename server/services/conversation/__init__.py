@@ -1,6 +1,14 @@
 """Conversation memory and management services."""
 
-from .memory import ConversationMemory, get_conversation_memory
+from .events import ConversationEvents, get_conversation_events
+from .memory import ConversationMemory, format_transcript, get_conversation_memory
 from .summarization import ConversationSummarizer
 
-__all__ = ["ConversationMemory", "get_conversation_memory", "ConversationSummarizer"]
\ No newline at end of file
+__all__ = [
+    "ConversationEvents",
+    "ConversationMemory",
+    "ConversationSummarizer",
+    "format_transcript",
+    "get_conversation_events",
+    "get_conversation_memory",
+]
\ No newline at end of file
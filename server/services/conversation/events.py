@@ -0,0 +1,51 @@
+"""In-process fan-out of newly recorded conversation messages."""
+
+import asyncio
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, Set
+
+from ...models.chat import ChatMessageDict
+from ...logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Bounded so a stalled subscriber cannot grow memory without limit
+_SUBSCRIBER_QUEUE_SIZE = 100
+
+
+class ConversationEvents:
+    """Publishes recorded messages to listeners subscribed to a session."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    @contextmanager
+    def subscribe(self, session_id: str) -> Iterator["asyncio.Queue[ChatMessageDict]"]:
+        """Yield a queue receiving messages recorded for the session until the block exits."""
+
+        queue: "asyncio.Queue[ChatMessageDict]" = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(session_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(session_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[session_id]
+
+    def publish(self, session_id: str, message: ChatMessageDict) -> None:
+        """Deliver a message to every current subscriber of the session."""
+
+        for queue in self._subscribers.get(session_id, ()):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping conversation event for slow subscriber on {session_id}")
+
+
+@lru_cache(maxsize=1)
+def get_conversation_events() -> ConversationEvents:
+    """Get the global conversation events instance."""
+    return ConversationEvents()
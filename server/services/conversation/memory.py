@@ -1,21 +1,164 @@
 """Conversation memory management using Supabase."""
 
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import asyncio
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
 from functools import lru_cache
 
-from ...models.chat import ChatMessage
-from ...services.supabase_client import get_supabase_client
+from ...config import get_settings
+from ...models.chat import ChatMessageDict
+from ...services.postgres import get_pg_pool
+from ...services.supabase_client import get_supabase_client, run_supabase
+from .events import get_conversation_events
 from ...logging_config import get_logger
+from ...utils.cache import TTLCache
 
 logger = get_logger(__name__)
 
+# Most rows one background insert carries
+_WRITE_BATCH_SIZE = 50
+
+# Sessions whose recent history is kept in memory
+_HISTORY_CACHE_MAXSIZE = 500
+
+# Transcript wrapping per message role; other roles are left out
+_TRANSCRIPT_TAGS = {
+    "user": ("<user_message>", "</user_message>"),
+    "assistant": ("<conductor_reply>", "</conductor_reply>"),
+    "specialist": ("<specialist_message>", "</specialist_message>"),
+}
+
+# Direct Postgres queries, used when an asyncpg pool is configured
+_INSERT_SQL = (
+    "INSERT INTO conversations (phone_number, role, content, message_id, timestamp) "
+    "VALUES ($1, $2, $3, $4, $5)"
+)
+_HISTORY_SQL = (
+    "SELECT role, content, timestamp FROM conversations "
+    "WHERE phone_number = $1 ORDER BY timestamp DESC, id DESC LIMIT $2"
+)
+_INSERT_SUMMARY_SQL = (
+    "INSERT INTO conversation_summaries (phone_number, summary, created_at) VALUES ($1, $2, $3)"
+)
+_LATEST_SUMMARY_SQL = (
+    "SELECT summary FROM conversation_summaries "
+    "WHERE phone_number = $1 ORDER BY created_at DESC LIMIT 1"
+)
+_LATEST_SUMMARY_TIME_SQL = (
+    "SELECT created_at FROM conversation_summaries "
+    "WHERE phone_number = $1 ORDER BY created_at DESC LIMIT 1"
+)
+_HISTORY_SINCE_SQL = (
+    "SELECT role, content, timestamp FROM conversations "
+    "WHERE phone_number = $1 AND timestamp > $3 ORDER BY timestamp, id LIMIT $2"
+)
+
+
+def _utc_timestamp() -> str:
+    """Current time in the canonical form datetime.fromisoformat parses directly."""
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+
+def format_transcript(messages: List[ChatMessageDict], summary: Optional[str] = None) -> str:
+    """Render messages as a tagged transcript, led by the summary when there is one."""
+
+    if not messages and not summary:
+        return ""
+
+    transcript_lines = []
+    if summary:
+        transcript_lines.append(f"<conversation_summary>{summary}</conversation_summary>")
+    for msg in messages:
+        tags = _TRANSCRIPT_TAGS.get(msg["role"])
+        if tags is None:
+            continue
+
+        timestamp = msg.get("timestamp")
+        # Keep YYYY-MM-DD HH:MM:SS format
+        suffix = f" ({timestamp[:19]})" if timestamp else ""
+        transcript_lines.append(f"{tags[0]}{msg['content']}{tags[1]}{suffix}")
+
+    return "\n".join(transcript_lines)
+
 
 class ConversationMemory:
     """Manages conversation history with Supabase storage."""
 
     def __init__(self):
         self.client = get_supabase_client()
+        # Rows waiting for the background writer, which inserts them in batches
+        self._write_queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+        self._writer_task: Optional["asyncio.Task[None]"] = None
+        # phone_number -> (limit, messages); a write drops the session's entry
+        self._history_cache = TTLCache(maxsize=_HISTORY_CACHE_MAXSIZE, ttl=get_settings().history_cache_ttl)
+        # Bumped on every write, so a read that raced one does not cache what it fetched
+        self._write_seq = 0
+
+    def _invalidate_history(self, phone_number: str) -> None:
+        """Drop cached history for a session after a write."""
+        self._write_seq += 1
+        self._history_cache.discard(phone_number)
+
+    def _publish(self, data: Dict[str, Any]) -> None:
+        """Notify live subscribers of a message that was just stored."""
+        get_conversation_events().publish(
+            data["phone_number"],
+            {'role': data['role'], 'content': data['content'], 'timestamp': data['timestamp']},
+        )
+
+    def _enqueue(self, data: Dict[str, Any]) -> None:
+        """Queue a row for the background writer, starting it on first use."""
+
+        if self._write_queue is None:
+            self._write_queue = asyncio.Queue()
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._write_loop())
+        self._invalidate_history(data["phone_number"])
+        self._write_queue.put_nowait(data)
+
+    async def _write_loop(self) -> None:
+        """Insert queued rows, coalescing everything queued meanwhile into one request."""
+
+        queue = self._write_queue
+        while True:
+            rows = [await queue.get()]
+            while len(rows) < _WRITE_BATCH_SIZE and not queue.empty():
+                rows.append(queue.get_nowait())
+
+            try:
+                await self._insert_rows(rows)
+                for row in rows:
+                    self._publish(row)
+                logger.debug(f"Recorded {len(rows)} conversation messages")
+            except Exception as e:
+                logger.error(f"Failed to record {len(rows)} conversation messages: {e}")
+            finally:
+                for _ in rows:
+                    queue.task_done()
+
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert conversation rows through the Postgres pool, or the REST client without one."""
+
+        pool = await get_pg_pool()
+        if pool is None:
+            await run_supabase(self.client.table('conversations').insert(rows).execute)
+            return
+
+        async with pool.acquire() as conn:
+            await conn.executemany(
+                _INSERT_SQL,
+                [
+                    (row["phone_number"], row["role"], row["content"], row["message_id"],
+                     datetime.fromisoformat(row["timestamp"]))
+                    for row in rows
+                ],
+            )
+
+    async def flush(self) -> None:
+        """Wait until every queued message has been written."""
+
+        if self._write_queue is not None and self._writer_task is not None and not self._writer_task.done():
+            await self._write_queue.join()
 
     async def record_user_message(self, phone_number: str, message: str, message_id: str = None) -> None:
         """Record a user message to the conversation history."""
@@ -24,20 +167,14 @@ class ConversationMemory:
             logger.warning("Cannot record message: Supabase client not available")
             return
 
-        try:
-            data = {
-                "phone_number": phone_number,
-                "role": "user",
-                "content": message,
-                "message_id": message_id,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-
-            result = self.client.table('conversations').insert(data).execute()
-            logger.debug(f"Recorded user message from {phone_number}")
-
-        except Exception as e:
-            logger.error(f"Failed to record user message: {e}")
+        # Every row carries the same keys so queued rows can share one bulk insert
+        self._enqueue({
+            "phone_number": phone_number,
+            "role": "user",
+            "content": message,
+            "message_id": message_id,
+            "timestamp": _utc_timestamp()
+        })
 
     async def record_assistant_message(self, phone_number: str, message: str) -> None:
         """Record an assistant response to the conversation history."""
@@ -46,19 +183,13 @@ class ConversationMemory:
             logger.warning("Cannot record message: Supabase client not available")
             return
 
-        try:
-            data = {
-                "phone_number": phone_number,
-                "role": "assistant",
-                "content": message,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-
-            result = self.client.table('conversations').insert(data).execute()
-            logger.debug(f"Recorded assistant message to {phone_number}")
-
-        except Exception as e:
-            logger.error(f"Failed to record assistant message: {e}")
+        self._enqueue({
+            "phone_number": phone_number,
+            "role": "assistant",
+            "content": message,
+            "message_id": None,
+            "timestamp": _utc_timestamp()
+        })
 
     async def record_specialist_message(self, phone_number: str, specialist_name: str, message: str) -> None:
         """Record a specialist message to the conversation history."""
@@ -67,75 +198,220 @@ class ConversationMemory:
             logger.warning("Cannot record message: Supabase client not available")
             return
 
+        self._enqueue({
+            "phone_number": phone_number,
+            "role": "specialist",
+            "content": f"[{specialist_name}] {message}",
+            "message_id": None,
+            "timestamp": _utc_timestamp()
+        })
+
+    async def _fetch_history(
+        self,
+        phone_number: str,
+        limit: int,
+        since: Optional[datetime],
+    ) -> List[ChatMessageDict]:
+        """Query stored messages through the Postgres pool, or the REST client without one.
+
+        Without since this is the latest limit messages; with since, the first limit
+        messages after it. Either way the result is in chronological order.
+        """
+
+        # Newest first lets the (phone_number, timestamp) index stop after limit rows
+        newest_first = since is None
+
+        pool = await get_pg_pool()
+        if pool is not None:
+            async with pool.acquire() as conn:
+                if since is None:
+                    rows = await conn.fetch(_HISTORY_SQL, phone_number, limit)
+                else:
+                    rows = await conn.fetch(_HISTORY_SINCE_SQL, phone_number, limit, since)
+            if newest_first:
+                rows.reverse()
+            return [
+                {
+                    'role': row['role'],
+                    'content': row['content'],
+                    'timestamp': row['timestamp'].isoformat(timespec="microseconds"),
+                }
+                for row in rows
+            ]
+
+        query = (
+            self.client
+            .table('conversations')
+            .select('role,content,timestamp')
+            .eq('phone_number', phone_number)
+        )
+        if since is not None:
+            # Served by the (phone_number, timestamp) index
+            query = query.gt('timestamp', since.isoformat())
+
+        result = await run_supabase(
+            query
+            .order('timestamp', desc=newest_first)
+            .order('id', desc=newest_first)  # Deterministic order for equal timestamps
+            .limit(limit)
+            .execute
+        )
+
+        rows = reversed(result.data) if newest_first else result.data
+        # Plain dicts internally; routes validate them once via response_model
+        return [
+            {'role': row['role'], 'content': row['content'], 'timestamp': row['timestamp']}
+            for row in rows
+        ]
+
+    async def get_conversation_history(
+        self,
+        phone_number: str,
+        limit: int = 100,
+        since: Optional[datetime] = None,
+    ) -> List[ChatMessageDict]:
+        """Get conversation history for a phone number, optionally only messages after since."""
+
+        if not self.client:
+            logger.warning("Cannot get history: Supabase client not available")
+            return []
+
+        # Full-history reads repeat per message; serve them from memory until the next write
+        write_seq = self._write_seq
+        if since is None:
+            cached = self._history_cache.get(phone_number)
+            if cached is not None:
+                cached_limit, cached_messages = cached
+                # A short result already holds the whole history, whatever the limit
+                if cached_limit >= limit or len(cached_messages) < cached_limit:
+                    return cached_messages[max(len(cached_messages) - limit, 0):]
+
         try:
-            data = {
-                "phone_number": phone_number,
-                "role": "specialist",
-                "content": f"[{specialist_name}] {message}",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            # Reads must see messages recorded just before them
+            await self.flush()
+
+            messages = await self._fetch_history(phone_number, limit, since)
+            # Skipped when any write landed during the fetch, since it may be missing
+            if since is None and self._write_seq == write_seq:
+                self._history_cache.set(phone_number, (limit, messages))
 
-            result = self.client.table('conversations').insert(data).execute()
-            logger.debug(f"Recorded specialist message from {specialist_name}")
+            logger.debug(f"Retrieved {len(messages)} messages for {phone_number}")
+            return messages[:]
 
         except Exception as e:
-            logger.error(f"Failed to record specialist message: {e}")
+            logger.error(f"Failed to get conversation history: {e}")
+            return []
 
-    async def get_conversation_history(self, phone_number: str, limit: int = 100) -> List[ChatMessage]:
-        """Get conversation history for a phone number."""
+    async def record_summary(
+        self,
+        phone_number: str,
+        summary: str,
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        """Store a conversation summary, stamped with the time its transcript was read when given."""
 
         if not self.client:
-            logger.warning("Cannot get history: Supabase client not available")
-            return []
+            logger.warning("Cannot record summary: Supabase client not available")
+            return
+
+        # Messages after this time are the ones the summary has not folded in yet
+        created_at = created_at or datetime.now(timezone.utc)
 
         try:
-            result = (
+            pool = await get_pg_pool()
+            if pool is not None:
+                async with pool.acquire() as conn:
+                    await conn.execute(_INSERT_SUMMARY_SQL, phone_number, summary, created_at)
+            else:
+                await run_supabase(
+                    self.client
+                    .table('conversation_summaries')
+                    .insert({
+                        "phone_number": phone_number,
+                        "summary": summary,
+                        "created_at": created_at.isoformat(),
+                    })
+                    .execute
+                )
+
+            logger.debug(f"Recorded conversation summary for {phone_number}")
+
+        except Exception as e:
+            logger.error(f"Failed to record conversation summary: {e}")
+
+    async def get_latest_summary(self, phone_number: str) -> Optional[str]:
+        """Get the most recent conversation summary for a phone number."""
+
+        if not self.client:
+            return None
+
+        try:
+            pool = await get_pg_pool()
+            if pool is not None:
+                async with pool.acquire() as conn:
+                    return await conn.fetchval(_LATEST_SUMMARY_SQL, phone_number)
+
+            result = await run_supabase(
                 self.client
-                .table('conversations')
-                .select('*')
+                .table('conversation_summaries')
+                .select('summary')
                 .eq('phone_number', phone_number)
-                .order('timestamp', desc=False)
-                .limit(limit)
-                .execute()
+                .order('created_at', desc=True)
+                .limit(1)
+                .execute
             )
-
-            messages = []
-            for row in result.data:
-                messages.append(ChatMessage(
-                    role=row['role'],
-                    content=row['content'],
-                    timestamp=row['timestamp']
-                ))
-
-            logger.debug(f"Retrieved {len(messages)} messages for {phone_number}")
-            return messages
+            return result.data[0]['summary'] if result.data else None
 
         except Exception as e:
-            logger.error(f"Failed to get conversation history: {e}")
-            return []
+            logger.error(f"Failed to get latest summary: {e}")
+            return None
 
-    async def get_conversation_transcript(self, phone_number: str, limit: int = 100) -> str:
-        """Get conversation history as a formatted transcript."""
+    async def get_latest_summary_time(self, phone_number: str) -> Optional[datetime]:
+        """Get when the most recent conversation summary was taken, if there is one."""
 
-        messages = await self.get_conversation_history(phone_number, limit)
+        if not self.client:
+            return None
 
-        if not messages:
-            return ""
+        try:
+            pool = await get_pg_pool()
+            if pool is not None:
+                async with pool.acquire() as conn:
+                    return await conn.fetchval(_LATEST_SUMMARY_TIME_SQL, phone_number)
 
-        transcript_lines = []
-        for msg in messages:
-            timestamp = msg.timestamp or ""
-            if timestamp:
-                timestamp = f" ({timestamp[:19]})"  # Keep YYYY-MM-DD HH:MM:SS format
+            result = await run_supabase(
+                self.client
+                .table('conversation_summaries')
+                .select('created_at')
+                .eq('phone_number', phone_number)
+                .order('created_at', desc=True)
+                .limit(1)
+                .execute
+            )
+            return datetime.fromisoformat(result.data[0]['created_at']) if result.data else None
 
-            if msg.role == "user":
-                transcript_lines.append(f"<user_message>{msg.content}</user_message>{timestamp}")
-            elif msg.role == "assistant":
-                transcript_lines.append(f"<conductor_reply>{msg.content}</conductor_reply>{timestamp}")
-            elif msg.role == "specialist":
-                transcript_lines.append(f"<specialist_message>{msg.content}</specialist_message>{timestamp}")
+        except Exception as e:
+            logger.error(f"Failed to get latest summary time: {e}")
+            return None
+
+    async def get_context_bundle(
+        self,
+        phone_number: str,
+        history_limit: int = 100,
+    ) -> Tuple[List[ChatMessageDict], Optional[str]]:
+        """Fetch recent history and the latest summary concurrently."""
+
+        # Separate pool connections (or executor threads), so one round trip instead of two
+        messages, summary = await asyncio.gather(
+            self.get_conversation_history(phone_number, history_limit),
+            self.get_latest_summary(phone_number),
+        )
+        return messages, summary
 
-        return "\n".join(transcript_lines)
+    async def get_conversation_transcript(self, phone_number: str, limit: int = 100) -> str:
+        """Get conversation history as a formatted transcript, led by the latest summary."""
+
+        messages, summary = await self.get_context_bundle(phone_number, limit)
+        return format_transcript(messages, summary)
 
     async def clear_conversation(self, phone_number: str) -> None:
         """Clear conversation history for a phone number."""
@@ -145,32 +421,67 @@ class ConversationMemory:
             return
 
         try:
-            result = (
-                self.client
-                .table('conversations')
-                .delete()
-                .eq('phone_number', phone_number)
-                .execute()
-            )
+            # Queued messages must not be inserted after the delete
+            await self.flush()
+            self._invalidate_history(phone_number)
+
+            pool = await get_pg_pool()
+            if pool is not None:
+                async with pool.acquire() as conn:
+                    await conn.execute("DELETE FROM conversations WHERE phone_number = $1", phone_number)
+                    await conn.execute(
+                        "DELETE FROM conversation_summaries WHERE phone_number = $1", phone_number
+                    )
+            else:
+                for table in ('conversations', 'conversation_summaries'):
+                    await run_supabase(
+                        self.client
+                        .table(table)
+                        .delete()
+                        .eq('phone_number', phone_number)
+                        .execute
+                    )
 
             logger.info(f"Cleared conversation history for {phone_number}")
 
         except Exception as e:
             logger.error(f"Failed to clear conversation: {e}")
 
-    async def get_message_count(self, phone_number: str) -> int:
-        """Get the number of messages in conversation history."""
+    async def get_message_count(
+        self,
+        phone_number: str,
+        cap: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> int:
+        """Get the number of messages in conversation history, counting at most cap when given.
+
+        With since (which requires cap), only messages after it are counted.
+        """
 
         if not self.client:
             return 0
 
+        if cap is not None:
+            # A bounded count is the size of the latest window, usually already in the history cache
+            return len(await self.get_conversation_history(phone_number, limit=cap, since=since))
+
         try:
-            result = (
+            # Reads must see messages recorded just before them
+            await self.flush()
+
+            pool = await get_pg_pool()
+            if pool is not None:
+                async with pool.acquire() as conn:
+                    return await conn.fetchval(
+                        "SELECT count(*) FROM conversations WHERE phone_number = $1", phone_number
+                    )
+
+            result = await run_supabase(
                 self.client
                 .table('conversations')
                 .select('id', count='exact')
                 .eq('phone_number', phone_number)
-                .execute()
+                .execute
             )
 
             return result.count or 0
@@ -1,7 +1,8 @@
 """Conversation summarization for memory management."""
 
-from typing import List, Optional
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
 
 from ...config import get_settings
 from ...openrouter_client import request_chat_completion
@@ -10,6 +11,17 @@ from .memory import ConversationMemory
 
 logger = get_logger(__name__)
 
+# Phone numbers with a background summary in flight, shared by all summarizer instances
+_summaries_in_flight: Set[str] = set()
+# Strong references so background summaries are not garbage collected mid-flight
+_background_tasks: Dict["asyncio.Task[Optional[str]]", str] = {}
+
+
+def _on_background_summary_done(task: "asyncio.Task[Optional[str]]") -> None:
+    _summaries_in_flight.discard(_background_tasks.pop(task))
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background summarization failed: {task.exception()}")
+
 
 class ConversationSummarizer:
     """Handles conversation summarization to manage memory efficiently."""
@@ -25,8 +37,37 @@ class ConversationSummarizer:
         if not self.settings.summarization_enabled:
             return False
 
-        message_count = await memory.get_message_count(phone_number)
-        return message_count >= self.settings.conversation_summary_threshold
+        # Only whether the threshold is reached matters, so never count past it
+        threshold = self.settings.conversation_summary_threshold
+        message_count = await memory.get_message_count(phone_number, cap=threshold)
+        return message_count >= threshold
+
+    def summarize_in_background(self, phone_number: str, memory: ConversationMemory) -> None:
+        """Start summarizing off the request path, unless a summary is already in progress."""
+
+        # Claimed before the task starts, so back-to-back turns cannot each queue one
+        if phone_number in _summaries_in_flight:
+            logger.debug(f"Summarization already running for {phone_number}")
+            return
+        _summaries_in_flight.add(phone_number)
+
+        task = asyncio.create_task(self._summarize_if_due(phone_number, memory))
+        _background_tasks[task] = phone_number
+        task.add_done_callback(_on_background_summary_done)
+
+    async def _summarize_if_due(self, phone_number: str, memory: ConversationMemory) -> Optional[str]:
+        """Summarize only once a full window of messages has arrived since the last summary."""
+
+        # The total stays over the threshold after the first summary, so gate on
+        # what the latest summary has not folded in yet
+        last_summary_at = await memory.get_latest_summary_time(phone_number)
+        if last_summary_at is not None:
+            window = self.settings.conversation_summary_window
+            new_messages = await memory.get_message_count(phone_number, cap=window, since=last_summary_at)
+            if new_messages < window:
+                return None
+
+        return await self.summarize_conversation(phone_number, memory)
 
     async def summarize_conversation(self, phone_number: str, memory: ConversationMemory) -> Optional[str]:
         """Summarize conversation history for a phone number."""
@@ -36,8 +77,12 @@ class ConversationSummarizer:
             return None
 
         try:
-            # Get full conversation history
-            transcript = await memory.get_conversation_transcript(phone_number)
+            # Taken before the read, so messages recorded while the summary is generated count as new
+            transcript_read_at = datetime.now(timezone.utc)
+            # The previous summary plus the latest window, so cost does not grow with history length
+            transcript = await memory.get_conversation_transcript(
+                phone_number, limit=self.settings.conversation_summary_window
+            )
 
             if not transcript.strip():
                 return None
@@ -47,7 +92,7 @@ class ConversationSummarizer:
 
             if summary:
                 # Store summary and optionally clear old messages
-                await self._store_summary(phone_number, summary, memory)
+                await self._store_summary(phone_number, summary, memory, transcript_read_at)
 
             return summary
 
@@ -89,7 +134,11 @@ Be comprehensive but concise. Focus on information that will help the assistant
         messages = [
             {
                 "role": "user",
-                "content": f"Please summarize this conversation with user {phone_number}:\n\n{transcript}"
+                "content": (
+                    f"Please summarize this conversation with user {phone_number}. "
+                    "If it starts with a <conversation_summary>, update that running summary "
+                    f"with the newer messages that follow it:\n\n{transcript}"
+                )
             }
         ]
 
@@ -114,23 +163,17 @@ Be comprehensive but concise. Focus on information that will help the assistant
 
         return None
 
-    async def _store_summary(self, phone_number: str, summary: str, memory: ConversationMemory) -> None:
-        """Store conversation summary and manage old messages."""
+    async def _store_summary(
+        self,
+        phone_number: str,
+        summary: str,
+        memory: ConversationMemory,
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        """Store conversation summary in the summaries table."""
 
         try:
-            # For now, we'll store the summary as a special message
-            # In a more advanced implementation, we might have a separate summaries table
-            summary_message = f"CONVERSATION_SUMMARY:\n{summary}\n\nGenerated at: {datetime.utcnow().isoformat()}"
-
-            await memory.record_specialist_message(
-                phone_number,
-                "ConversationSummarizer",
-                summary_message
-            )
-
-            # Optionally: Clear older messages, keeping only recent ones
-            # This would require implementing a more sophisticated cleanup strategy
-
+            await memory.record_summary(phone_number, summary, created_at)
             logger.info(f"Stored conversation summary for {phone_number}")
 
         except Exception as e:
@@ -138,25 +181,4 @@ Be comprehensive but concise. Focus on information that will help the assistant
 
     async def get_latest_summary(self, phone_number: str, memory: ConversationMemory) -> Optional[str]:
         """Get the most recent conversation summary."""
-
-        try:
-            messages = await memory.get_conversation_history(phone_number, limit=50)
-
-            # Look for the most recent summary message
-            for message in reversed(messages):
-                if (message.role == "specialist" and
-                    message.content.startswith("[ConversationSummarizer] CONVERSATION_SUMMARY:")):
-
-                    # Extract just the summary content
-                    content = message.content
-                    if "CONVERSATION_SUMMARY:\n" in content:
-                        summary_start = content.find("CONVERSATION_SUMMARY:\n") + len("CONVERSATION_SUMMARY:\n")
-                        summary_end = content.find("\n\nGenerated at:")
-                        if summary_end > summary_start:
-                            return content[summary_start:summary_end].strip()
-
-            return None
-
-        except Exception as e:
-            logger.error(f"Failed to get latest summary: {e}")
-            return None
\ No newline at end of file
+        return await memory.get_latest_summary(phone_number)
@@ -0,0 +1,59 @@
+"""Direct Postgres connection pool for hot database paths."""
+
+import asyncio
+from typing import Optional
+
+import asyncpg
+
+from ..config import get_settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_failed = False
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def get_pg_pool() -> Optional[asyncpg.Pool]:
+    """Get the shared asyncpg pool, or None when no database URL is configured or it is unreachable."""
+
+    global _pool, _pool_failed, _pool_lock
+
+    if _pool is not None or _pool_failed:
+        return _pool
+
+    settings = get_settings()
+    if not settings.supabase_db_url:
+        return None
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is None and not _pool_failed:
+            try:
+                _pool = await asyncpg.create_pool(
+                    settings.supabase_db_url,
+                    min_size=settings.pg_pool_min_size,
+                    max_size=settings.pg_pool_max_size,
+                    max_inactive_connection_lifetime=1800,
+                    # Supabase's transaction-mode pooler cannot keep prepared statements
+                    statement_cache_size=0,
+                )
+                logger.info("Postgres connection pool initialized successfully")
+            except Exception as e:
+                # Remember the failure so callers fall back to the REST client without retrying
+                _pool_failed = True
+                logger.error(f"Failed to initialize Postgres pool, using Supabase REST: {e}")
+
+    return _pool
+
+
+async def close_pg_pool() -> None:
+    """Close the shared asyncpg pool and its connections."""
+
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
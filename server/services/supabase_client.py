@@ -1,7 +1,9 @@
 """Supabase client for database operations."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from supabase import create_client, Client
 
@@ -10,6 +12,17 @@ from ..logging_config import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# supabase-py is synchronous; its HTTP round trips run here instead of on the event loop
+_SUPABASE_MAX_WORKERS = 16
+_executor = ThreadPoolExecutor(max_workers=_SUPABASE_MAX_WORKERS, thread_name_prefix="supabase")
+
+
+async def run_supabase(fn: Callable[[], T]) -> T:
+    """Run a blocking Supabase call in the shared thread pool and await its result."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn)
+
 
 @lru_cache(maxsize=1)
 def get_supabase_client() -> Optional[Client]:
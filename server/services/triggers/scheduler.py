@@ -141,11 +141,9 @@ class TriggerScheduler:
             logger.info(f"⏰ SCHEDULER: Task description: '{description}'")
 
             # Execute using Planner-Worker
-            from ...planner import TaskPlanner
-            from ...workers import TaskWorker
+            from ...conductor.tools import get_planner_worker
 
-            planner = TaskPlanner()
-            worker = TaskWorker()
+            planner, worker = get_planner_worker()
 
             # Create context
             context = {
@@ -224,17 +222,9 @@ class TriggerScheduler:
 
         try:
             from ...services.conversation import get_conversation_memory
-            from ...models.chat import ChatMessage
 
             memory = get_conversation_memory()
 
-            # Create a system message for the reminder notification
-            notification_message = ChatMessage(
-                role="assistant",
-                content=message,
-                timestamp=datetime.utcnow().isoformat()
-            )
-
             # Handle user ID mapping - check if we need to resolve to actual session ID
             session_id = await self._resolve_session_id(phone_number)
 
@@ -311,8 +301,8 @@ class TriggerScheduler:
 
                 if due_reminders:
                     print(f"📋 Found {len(due_reminders)} due reminders to process", flush=True)
-                    for reminder in due_reminders:
-                        await self.execute_reminder(reminder)
+                    # Reminders are independent; overlap their planner and LLM round trips
+                    await asyncio.gather(*(self.execute_reminder(reminder) for reminder in due_reminders))
                 else:
                     # Only log every 10 checks to avoid spam
                     import time
@@ -1,15 +1,31 @@
 """Tool Registry - Discovery and execution of all available tools."""
 
+import copy
 import inspect
+import json
 from typing import Any, Callable, Dict, List, Optional
 
 from ..logging_config import get_logger
+from ..utils.cache import TTLCache
 from . import gmail_tool
 from . import llm_tool
 from . import scheduler_tool
 
 logger = get_logger(__name__)
 
+# Read-only tools whose successful results can be reused for a short while.
+# Mutating tools (send_email, schedule_task, ...) are never cached.
+_CACHEABLE_TOOLS = frozenset({
+    "gmail_tool.fetch_emails",
+    "gmail_tool.search_emails",
+    "gmail_tool.get_profile",
+    "gmail_tool.check_recent_emails",
+    "gmail_tool.get_email_content",
+})
+
+# Shared across registries, since every TaskWorker builds its own
+_tool_result_cache = TTLCache(maxsize=256, ttl=60.0)
+
 
 class ToolRegistry:
     """Registry for discovering and executing tools."""
@@ -125,6 +141,16 @@ class ToolRegistry:
             bound_args.apply_defaults()
             logger.info(f"✅ Arguments bound successfully: {bound_args.arguments}")
 
+            # Bound arguments include user_id, so cached results stay per user
+            cache_key = None
+            if tool_name in _CACHEABLE_TOOLS:
+                cache_key = (tool_name, json.dumps(bound_args.arguments, sort_keys=True, default=str))
+                cached = _tool_result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"🔧 TOOL: ♻️ {tool_name} served from cache")
+                    # Callers may mutate results, so each gets its own copy
+                    return copy.deepcopy(cached)
+
             # Call the function
             if inspect.iscoroutinefunction(func):
                 logger.info(f"🔄 Calling async function {tool_name}...")
@@ -133,6 +159,9 @@ class ToolRegistry:
                 logger.info(f"🔄 Calling sync function {tool_name}...")
                 result = func(**bound_args.arguments)
 
+            if cache_key is not None:
+                _tool_result_cache.set(cache_key, copy.deepcopy(result))
+
             logger.info(f"🔧 TOOL: ✅ {tool_name} completed successfully")
             logger.info(f"📊 Tool result type: {type(result)}")
             logger.info(f"📊 Tool result: {result}")
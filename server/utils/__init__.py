@@ -1,5 +1,6 @@
 """Utility functions for Personal Assistant."""
 
+from .cache import TTLCache
 from .responses import error_response
 
-__all__ = ["error_response"]
\ No newline at end of file
+__all__ = ["TTLCache", "error_response"]
\ No newline at end of file
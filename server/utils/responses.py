@@ -1,12 +1,12 @@
 """Response utility functions."""
 
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 
-def error_response(message: str, status_code: int = status.HTTP_400_BAD_REQUEST) -> JSONResponse:
+def error_response(message: str, status_code: int = status.HTTP_400_BAD_REQUEST) -> ORJSONResponse:
     """Create standardized error response."""
-    return JSONResponse(
+    return ORJSONResponse(
         content={"ok": False, "error": message},
         status_code=status_code
     )
\ No newline at end of file
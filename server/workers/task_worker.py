@@ -1,8 +1,10 @@
 """Task Worker - LLM-powered executor that follows plans and calls tools."""
 
+import asyncio
 import json
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from ..config import get_settings
 from ..openrouter_client import request_chat_completion
@@ -11,6 +13,9 @@ from ..planner.planner import ExecutionPlan, PlanStep
 
 logger = get_logger(__name__)
 
+# A whole-value reference to an earlier step's result, e.g. "{step_1_result}"
+_STEP_REF_RE = re.compile(r"^\{step_(.+)_result\}$")
+
 
 @dataclass
 class WorkerResult:
@@ -38,6 +43,7 @@ class TaskWorker:
 
     MAX_RETRIES = 3
     MAX_EXECUTION_STEPS = 20
+    MAX_PARALLEL_STEPS = 8
 
     def __init__(self):
         settings = get_settings()
@@ -66,59 +72,64 @@ class TaskWorker:
                 context = {}
             context["user_id"] = context.get("user_id", "web_user")
 
-            # Execute each step
-            for i, step in enumerate(plan.steps):
-                if i >= self.MAX_EXECUTION_STEPS:
-                    raise RuntimeError(f"Exceeded maximum execution steps ({self.MAX_EXECUTION_STEPS})")
-
-                logger.info(f"⚙️ WORKER: 🔄 Executing step {i+1}/{len(plan.steps)}: {step.step_id}")
-                logger.info(f"⚙️ WORKER: Tool: {step.tool}")
-                logger.info(f"⚙️ WORKER: Description: {step.description}")
-
-                # Resolve arguments with previous step results
-                resolved_args = self._resolve_step_arguments(step.args, step_results, context)
-
-                # Execute the step with retries
-                step_result = await self._execute_step_with_retries(step, resolved_args)
-
-                # Log the step execution
-                log_entry = {
-                    "step_id": step.step_id,
-                    "tool": step.tool,
-                    "args": resolved_args,
-                    "success": step_result.success,
-                    "retry_count": step_result.retry_count
-                }
-
-                if step_result.success:
-                    log_entry["result"] = step_result.result
-                    step_results[f"step_{step.step_id}_result"] = step_result.result
-                    logger.info(f"⚙️ WORKER: ✅ Step {i+1} completed successfully")
-                else:
-                    log_entry["error"] = step_result.error
-                    logger.error(f"⚙️ WORKER: ❌ Step {i+1} failed: {step_result.error}")
-                    # Decide whether to continue or abort using LLM
-                    should_continue = await self._should_continue_after_error(
-                        plan, step, step_result.error, step_results, i
-                    )
-                    if not should_continue:
-                        logger.warning(f"⚙️ WORKER: 🛑 Aborting execution after step {i+1} failure")
-                        execution_log.append(log_entry)
-                        # Generate helpful error message for Gmail connection issues
-                        if "Gmail not connected" in step_result.error or "No connected account found" in step_result.error:
-                            error_message = f"📧 **Gmail Connection Required**\n\nI tried to {step.description.lower()}, but your Gmail account isn't connected yet.\n\n**To connect Gmail:**\n1. Use the Gmail settings in the interface\n2. Follow the connection process\n3. Try your request again\n\n*Task: {plan.task_description}*"
-                        else:
-                            error_message = f"❌ **Task Failed**\n\n{step_result.error}\n\nSteps completed: {i + 1}/{len(plan.steps)}"
-
-                        return WorkerResult(
-                            success=False,
-                            final_result=error_message,
-                            steps_executed=i + 1,
-                            execution_log=execution_log,
-                            error=step_result.error
-                        )
+            if len(plan.steps) > self.MAX_EXECUTION_STEPS:
+                raise RuntimeError(f"Exceeded maximum execution steps ({self.MAX_EXECUTION_STEPS})")
+
+            # Steps in the same level do not depend on each other, so run them together
+            semaphore = asyncio.Semaphore(self.MAX_PARALLEL_STEPS)
+            steps_executed = 0
 
-                execution_log.append(log_entry)
+            for level in self._group_steps_by_level(plan.steps):
+                if len(level) > 1:
+                    logger.info(f"⚙️ WORKER: ⚡ Running steps {[plan.steps[i].step_id for i in level]} in parallel")
+
+                outcomes = await asyncio.gather(
+                    *(self._run_step(plan, i, step_results, context, semaphore) for i in level)
+                )
+
+                # Record outcomes in plan order so logs and results stay deterministic
+                for i, (resolved_args, step_result) in zip(level, outcomes):
+                    step = plan.steps[i]
+                    steps_executed += 1
+
+                    # Log the step execution
+                    log_entry = {
+                        "step_id": step.step_id,
+                        "tool": step.tool,
+                        "args": resolved_args,
+                        "success": step_result.success,
+                        "retry_count": step_result.retry_count
+                    }
+
+                    if step_result.success:
+                        log_entry["result"] = step_result.result
+                        step_results[f"step_{step.step_id}_result"] = step_result.result
+                        logger.info(f"⚙️ WORKER: ✅ Step {i+1} completed successfully")
+                    else:
+                        log_entry["error"] = step_result.error
+                        logger.error(f"⚙️ WORKER: ❌ Step {i+1} failed: {step_result.error}")
+                        # Decide whether to continue or abort using LLM
+                        should_continue = await self._should_continue_after_error(
+                            plan, step, step_result.error, step_results, i
+                        )
+                        if not should_continue:
+                            logger.warning(f"⚙️ WORKER: 🛑 Aborting execution after step {i+1} failure")
+                            execution_log.append(log_entry)
+                            # Generate helpful error message for Gmail connection issues
+                            if "Gmail not connected" in step_result.error or "No connected account found" in step_result.error:
+                                error_message = f"📧 **Gmail Connection Required**\n\nI tried to {step.description.lower()}, but your Gmail account isn't connected yet.\n\n**To connect Gmail:**\n1. Use the Gmail settings in the interface\n2. Follow the connection process\n3. Try your request again\n\n*Task: {plan.task_description}*"
+                            else:
+                                error_message = f"❌ **Task Failed**\n\n{step_result.error}\n\nSteps completed: {steps_executed}/{len(plan.steps)}"
+
+                            return WorkerResult(
+                                success=False,
+                                final_result=error_message,
+                                steps_executed=steps_executed,
+                                execution_log=execution_log,
+                                error=step_result.error
+                            )
+
+                    execution_log.append(log_entry)
 
             # Generate final result using LLM
             logger.info(f"⚙️ WORKER: 📝 Generating final result summary...")
@@ -144,6 +155,66 @@ class TaskWorker:
                 error=str(e)
             )
 
+    async def _run_step(
+        self,
+        plan: ExecutionPlan,
+        index: int,
+        step_results: Dict[str, Any],
+        context: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[Dict[str, Any], StepResult]:
+        """Resolve a step's arguments and execute it, bounded by the semaphore."""
+
+        step = plan.steps[index]
+        async with semaphore:
+            logger.info(f"⚙️ WORKER: 🔄 Executing step {index+1}/{len(plan.steps)}: {step.step_id}")
+            logger.info(f"⚙️ WORKER: Tool: {step.tool}")
+            logger.info(f"⚙️ WORKER: Description: {step.description}")
+
+            # Resolve arguments with previous step results
+            resolved_args = self._resolve_step_arguments(step.args, step_results, context)
+
+            # Execute the step with retries
+            step_result = await self._execute_step_with_retries(step, resolved_args)
+
+        return resolved_args, step_result
+
+    def _group_steps_by_level(self, steps: List[PlanStep]) -> List[List[int]]:
+        """Group step indexes into levels whose steps only depend on earlier levels."""
+
+        index_by_id: Dict[str, int] = {}
+        for i, step in enumerate(steps):
+            index_by_id.setdefault(step.step_id, i)
+
+        pending: Dict[int, Set[int]] = {}
+        for i, step in enumerate(steps):
+            if step.depends_on is None:
+                # Undeclared dependencies keep the original sequential order
+                dependencies = {i - 1} if i else set()
+            else:
+                dependencies = {index_by_id[dep] for dep in step.depends_on if dep in index_by_id}
+            # Placeholders like "{step_1_result}" are dependencies even if not declared
+            for value in step.args.values():
+                match = _STEP_REF_RE.match(value) if isinstance(value, str) else None
+                if match and match.group(1) in index_by_id:
+                    dependencies.add(index_by_id[match.group(1)])
+            dependencies.discard(i)
+            pending[i] = dependencies
+
+        levels: List[List[int]] = []
+        done: Set[int] = set()
+        while pending:
+            ready = [i for i in sorted(pending) if pending[i] <= done]
+            if not ready:
+                # Dependency cycle; fall back to plan order for the rest
+                ready = [min(pending)]
+            for i in ready:
+                del pending[i]
+            done.update(ready)
+            levels.append(ready)
+
+        return levels
+
     async def _execute_step_with_retries(self, step: PlanStep, args: Dict[str, Any]) -> StepResult:
         """Execute a single step with retry logic."""
 